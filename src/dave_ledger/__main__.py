@@ -1,5 +1,41 @@
+import argparse
+import json
+
 from dave_ledger.core.config import load_config
 
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="dave_ledger", description="DAVE Ledger command line.")
+    sub = parser.add_subparsers(dest="command")
+
+    watch = sub.add_parser("watch", help="Re-ingest and revalue when data or config change.")
+    watch.add_argument("--interval", type=float, default=2.0, help="Seconds between file checks.")
+    watch.add_argument("--debounce", type=float, default=5.0, help="Quiet seconds before a rerun.")
+    watch.add_argument("--poll-every", type=float, default=6 * 3600.0, help="Seconds between ingest polls.")
+    watch.add_argument("--play-by-play", action="store_true", help="Also refresh play-by-play features.")
+
+    sub.add_parser("status", help="Show the watcher's last run and next scheduled poll.")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "watch":
+        from dave_ledger.watch import Watcher
+
+        Watcher(
+            interval=args.interval,
+            debounce=args.debounce,
+            poll_every=args.poll_every,
+            play_by_play=args.play_by_play,
+        ).run_forever()
+    elif args.command == "status":
+        from dave_ledger.watch import read_status
+
+        status = read_status()
+        print(json.dumps(status, indent=2) if status else "No watch status yet.")
+    else:
+        cfg = load_config()
+        print(f"DAVE Ledger OK. Config keys: {sorted(cfg.keys())}")
+
+
 if __name__ == "__main__":
-    cfg = load_config()
-    print(f"DAVE Ledger OK. Config keys: {sorted(cfg.keys())}")
+    main()
@@ -1,6 +1,9 @@
 """Analysis modules for DAVE Ledger."""
 
+from .backtest import run_backtest, score_backtest
 from .baselines import calculate_replacement_level
+from .comps import CompsEngine
+from .lineups import solve_lineups
 from .valuation import AssetValuator
 
-__all__ = ["AssetValuator", "calculate_replacement_level"]
+__all__ = ["AssetValuator", "CompsEngine", "calculate_replacement_level", "run_backtest", "score_backtest", "solve_lineups"]
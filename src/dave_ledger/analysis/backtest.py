@@ -0,0 +1,221 @@
+import logging
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from . import baselines, lineups
+from .history import active_game_mask
+from .valuation import AssetValuator
+
+logger = logging.getLogger(__name__)
+
+
+def _pit_baselines(season_to_date: pd.DataFrame, cfg: Dict[str, Any], starters: pd.DataFrame) -> Dict[str, float]:
+    """
+    Replacement levels using only the games played (and lineups started) so far this season.
+    Quiet: one block of per-position lines per simulated week is just noise here.
+    """
+    return baselines.calculate_replacement_level(season_to_date, cfg, starters_df=starters, verbose=False)
+
+
+def run_backtest(
+    df: pd.DataFrame,
+    cfg: Dict[str, Any],
+    horizon_weeks: int = 17,
+    min_games: int = 4,
+    start_season: Optional[int] = None,
+    fixed_baselines: Optional[Dict[str, float]] = None,
+) -> pd.DataFrame:
+    """
+    Point-in-time backtest of the valuation model.
+
+    Sweeps forward once through the (season, week) sorted history, keeping cumulative
+    per-player aggregates, and emits an as-of talent/availability/risk/DCF snapshot
+    after every week. Each snapshot only sees games up to and including that week.
+    Realized PPG is the active-game average over the next `horizon_weeks` weeks of
+    data (NaN when fewer than `min_games` or the window runs past the end of history).
+    """
+    df = df.copy()
+    if 'fantasy_group' not in df.columns:
+        df['fantasy_group'] = df['position']
+    df = df.sort_values(['season', 'week'], kind='stable').reset_index(drop=True)
+
+    valuator = AssetValuator(df, cfg)
+    current_year = cfg['context']['current_year']
+
+    # --- 1. Encode rows as integer arrays ---
+    p_codes, player_ids = pd.factorize(df['player_id'])
+    seasons = np.sort(df['season'].unique())
+    s_codes = np.searchsorted(seasons, df['season'].to_numpy())
+    steps = df[['season', 'week']].drop_duplicates().reset_index(drop=True)
+    t_codes = pd.MultiIndex.from_frame(steps).get_indexer(pd.MultiIndex.from_frame(df[['season', 'week']]))
+    step_bounds = np.searchsorted(t_codes, np.arange(len(steps) + 1))
+
+    n_players, n_seasons, n_steps = len(player_ids), len(seasons), len(steps)
+    points = df['fantasy_points'].fillna(0).to_numpy(dtype=float)
+    active = active_game_mask(df).to_numpy()
+    groups = df['fantasy_group'].to_numpy(dtype=object)
+
+    if 'birth_year' in df.columns:
+        birth_year = df['birth_year'].to_numpy(dtype=float, na_value=np.nan)
+    else:
+        birth_year = (current_year + 1) - df['current_age'].to_numpy(dtype=float, na_value=np.nan)
+    if 'years_exp' in df.columns:
+        years_exp = df['years_exp'].to_numpy(dtype=float, na_value=np.nan)
+    else:
+        years_exp = np.full(len(df), 5.0)
+
+    # --- 2. Cumulative aggregates (updated one week at a time) ---
+    active_pts = np.zeros((n_players, n_seasons))
+    active_cnt = np.zeros((n_players, n_seasons))
+    seen_season = np.zeros((n_players, n_seasons), dtype=bool)
+    n_rows = np.zeros(n_players)
+    sum_pts = np.zeros(n_players)
+    sum_sq = np.zeros(n_players)
+    last_row = np.full(n_players, -1)
+
+    # Per-week active totals for the realized-outcome windows
+    week_pts = np.zeros((n_players, n_steps))
+    week_games = np.zeros((n_players, n_steps))
+    np.add.at(week_pts, (p_codes[active], t_codes[active]), points[active])
+    np.add.at(week_games, (p_codes[active], t_codes[active]), 1.0)
+
+    # Weekly lineups are independent of each other, so one solve serves every snapshot:
+    # each step takes its season-to-date slice of the (season, week) sorted starters
+    if fixed_baselines is None:
+        starters = lineups.solve_lineups(df, cfg)
+        lu_codes = pd.MultiIndex.from_frame(steps).get_indexer(pd.MultiIndex.from_frame(starters[['season', 'week']]))
+        lu_bounds = np.searchsorted(lu_codes, np.arange(n_steps + 1))
+        season_first_step = np.searchsorted(steps['season'].to_numpy(), steps['season'].to_numpy())
+
+    annuity = sum(17 / ((1 + valuator.discount_rate) ** i) for i in range(1, 4))
+    snapshots = []
+
+    for t in range(n_steps):
+        lo, hi = step_bounds[t], step_bounds[t + 1]
+        p, s, pts, act = p_codes[lo:hi], s_codes[lo:hi], points[lo:hi], active[lo:hi]
+
+        np.add.at(active_pts, (p[act], s[act]), pts[act])
+        np.add.at(active_cnt, (p[act], s[act]), 1.0)
+        seen_season[p, s] = True
+        np.add.at(n_rows, p, 1.0)
+        np.add.at(sum_pts, p, pts)
+        np.add.at(sum_sq, p, pts ** 2)
+        last_row[p] = np.arange(lo, hi)
+
+        season, week = steps.loc[t, 'season'], steps.loc[t, 'week']
+        if start_season is not None and season < start_season:
+            continue
+
+        idx = np.flatnonzero(n_rows > 0)
+        latest = last_row[idx]
+        grp = groups[latest]
+
+        # Talent: recency-weighted PPG, weights relative to the as-of season
+        w = np.array([valuator.year_weights.get(int(season - yr), 0.1) for yr in seasons])
+        w[seasons > season] = 0.0
+        num = active_pts[idx] @ w
+        den = active_cnt[idx] @ w
+        talent = np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+
+        # Availability: Bayesian blend of games played vs the positional prior
+        priors = np.array([valuator.pos_priors.get(g, 0.90) for g in grp])
+        weight = valuator.availability_weight
+        played = active_cnt[idx].sum(axis=1)
+        possible = seen_season[idx].sum(axis=1) * 17
+        availability = np.minimum((played + priors * weight) / (possible + weight), 1.0)
+
+        # Risk: coefficient of variation over every logged game
+        n = n_rows[idx]
+        mean = sum_pts[idx] / n
+        var = np.divide(sum_sq[idx] - n * mean ** 2, n - 1, out=np.full_like(n, np.nan), where=n > 1)
+        std = np.sqrt(np.clip(var, 0, None))
+        risk = np.nan_to_num(std / np.where(mean == 0, 1.0, mean))
+
+        # Projection: as-of age is "age next season", matching transform.py
+        if fixed_baselines is not None:
+            pos_baselines = fixed_baselines
+        else:
+            first = season_first_step[t]
+            pos_baselines = _pit_baselines(
+                df.iloc[step_bounds[first]:hi], cfg, starters.iloc[lu_bounds[first]:lu_bounds[t + 1]]
+            )
+        floors = np.array([pos_baselines.get(g, 0.0) for g in grp])
+        age = (season + 1) - birth_year[latest]
+        dcf = valuator.project_dcf(talent, availability, age, years_exp[latest], grp, floors)
+
+        snapshots.append(pd.DataFrame({
+            'season': season,
+            'week': week,
+            'step': t,
+            'player_id': player_ids[idx],
+            'fantasy_group': grp,
+            'current_age': age,
+            'talent_ppg': talent,
+            'availability_score': availability,
+            'risk_cv': risk,
+            'dcf_value': dcf,
+            'vorp': dcf - floors * annuity,
+            '_code': idx,
+        }))
+
+    if not snapshots:
+        raise ValueError("Backtest produced no snapshots (check start_season).")
+    out = pd.concat(snapshots, ignore_index=True)
+
+    # --- 3. Realized outcomes over the following window (strictly after the snapshot) ---
+    cum_pts = np.concatenate([np.zeros((n_players, 1)), np.cumsum(week_pts, axis=1)], axis=1)
+    cum_games = np.concatenate([np.zeros((n_players, 1)), np.cumsum(week_games, axis=1)], axis=1)
+    step = out['step'].to_numpy()
+    code = out['_code'].to_numpy()
+    end = np.minimum(step + 1 + horizon_weeks, n_steps)
+    fut_pts = cum_pts[code, end] - cum_pts[code, step + 1]
+    fut_games = cum_games[code, end] - cum_games[code, step + 1]
+    valid = (step + horizon_weeks < n_steps) & (fut_games >= min_games)
+
+    out['realized_games'] = fut_games
+    out['realized_ppg'] = np.where(valid, fut_pts / np.maximum(fut_games, 1), np.nan)
+
+    logger.info(f"   -> Backtest: {n_steps} weeks, {len(out):,} player snapshots.")
+    return out.drop(columns=['_code'])
+
+
+def score_backtest(
+    snapshots: pd.DataFrame,
+    predictors=('talent_ppg', 'dcf_value'),
+    by_position: bool = False,
+) -> pd.DataFrame:
+    """
+    Scores as-of predictions against realized PPG, one row per snapshot week.
+    Rank correlation (Spearman) for every predictor; MAE/RMSE/bias for talent_ppg,
+    which is on the same per-game scale as the outcome.
+    """
+    keys = ['season', 'week'] + (['fantasy_group'] if by_position else [])
+    scored = snapshots.dropna(subset=['realized_ppg']).copy()
+    grouped = scored.groupby(keys)
+
+    ry = grouped['realized_ppg'].rank()
+    metrics = grouped.size().rename('n').to_frame()
+
+    for col in predictors:
+        rx = grouped[col].rank()
+        tmp = pd.DataFrame({'x': rx, 'y': ry, 'xy': rx * ry, 'xx': rx ** 2, 'yy': ry ** 2})
+        for k in keys:
+            tmp[k] = scored[k]
+        m = tmp.groupby(keys).mean()
+        cov = m['xy'] - m['x'] * m['y']
+        var_x = m['xx'] - m['x'] ** 2
+        var_y = m['yy'] - m['y'] ** 2
+        metrics[f'spearman_{col}'] = cov / np.sqrt(var_x * var_y)
+
+    err = scored['talent_ppg'] - scored['realized_ppg']
+    err_df = pd.DataFrame({'abs': err.abs(), 'sq': err ** 2, 'err': err})
+    for k in keys:
+        err_df[k] = scored[k]
+    e = err_df.groupby(keys).mean()
+    metrics['mae'] = e['abs']
+    metrics['rmse'] = np.sqrt(e['sq'])
+    metrics['bias'] = e['err']
+
+    return metrics.reset_index()
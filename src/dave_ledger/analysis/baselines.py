@@ -1,14 +1,24 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict
+from typing import Dict, Optional
+
+from . import lineups
 
 logger = logging.getLogger(__name__)
 
-def calculate_replacement_level(df: pd.DataFrame, cfg: Dict) -> Dict[str, float]:
+def calculate_replacement_level(
+    df: pd.DataFrame,
+    cfg: Dict,
+    starters_df: Optional[pd.DataFrame] = None,
+    verbose: bool = True,
+) -> Dict[str, float]:
     """
     Calculates Baseline PPG using the 'fantasy_group' column.
+    `starters_df` is a precomputed lineups.solve_lineups() result for the current season
+    (solved here when omitted); verbose=False demotes the per-position lines to DEBUG.
     """
+    log = logger.info if verbose else logger.debug
     league = cfg['league']
     teams = league['num_teams']
     starters = league['starters']
@@ -34,23 +44,35 @@ def calculate_replacement_level(df: pd.DataFrame, cfg: Dict) -> Dict[str, float]
     ppg_map.rename(columns={target_col: 'ppg', 'fantasy_group': 'position'}, inplace=True)
     baselines = {}
     
-    # Flex Definitions
-    flex_split = {'RB': 0.5, 'WR': 0.5, 'TE': 0.0} 
-    idp_flex_split = {'LB': 0.6, 'DL': 0.4, 'DB': 0.0}
+    # Flex Definitions: who actually fills FLEX/SUPERFLEX/IDP_FLEX in the optimal weekly
+    # lineups this season. The fixed splits are only a fallback when nothing can be solved.
+    flex_shares = {
+        'FLEX': {'RB': 0.5, 'WR': 0.5, 'TE': 0.0},
+        'SUPERFLEX': {'QB': 1.0},
+        'IDP_FLEX': {'LB': 0.6, 'DL': 0.4, 'DB': 0.0},
+    }
+    if starters_df is None and 'week' in df_curr.columns:
+        starters_df = lineups.solve_lineups(df_curr, cfg)
+    if starters_df is not None:
+        solved = lineups.flex_composition(starters_df)
+        for slot, shares in solved.items():
+            flex_shares[slot] = shares
+            mix = ", ".join(f"{p} {v:.0%}" for p, v in sorted(shares.items(), key=lambda kv: -kv[1]))
+            log(f"🔀 {slot} realized mix: {mix}")
     
     # 2. Iterate through GENERIC slots (The keys in your YAML starters)
     # e.g., QB, RB, LB, DL...
-    target_positions = [k for k in starters.keys() if k not in ['FLEX', 'SUPERFLEX', 'IDP_FLEX', 'DEF']]
+    # Flex slots (including any custom league.flex_eligibility ones) are not positions
+    not_positions = set(lineups.flex_eligibility(cfg)) | {'DEF'}
+    target_positions = [k for k in starters.keys() if k not in not_positions]
     
     for pos in target_positions:
         base_starts = starters.get(pos, 0)
         
         # --- A. DISTRIBUTE VIRTUAL STARTERS ---
         effective_starts = base_starts
-        
-        if pos == 'QB': effective_starts += starters.get('SUPERFLEX', 0)
-        if pos in flex_split: effective_starts += starters.get('FLEX', 0) * flex_split[pos]
-        if pos in idp_flex_split: effective_starts += starters.get('IDP_FLEX', 0) * idp_flex_split[pos]
+        for slot, shares in flex_shares.items():
+            effective_starts += starters.get(slot, 0) * shares.get(pos, 0.0)
 
         # --- B. APPLY DEPTH ---
         factor = bench_factors.get(pos, 0.0)
@@ -70,7 +92,7 @@ def calculate_replacement_level(df: pd.DataFrame, cfg: Dict) -> Dict[str, float]
                 if not valid_pool.empty:
                     baseline_score = valid_pool.iloc[-1]['ppg']
             
-            logger.info(f"📉 {pos} Baseline: {effective_starts:.1f} starts -> Rank {total_slots} ({baseline_row['full_name']}) = {baseline_score:.2f} PPG")
+            log(f"📉 {pos} Baseline: {effective_starts:.1f} starts -> Rank {total_slots} ({baseline_row['full_name']}) = {baseline_score:.2f} PPG")
         else:
             baseline_score = 0.0
             if total_slots > 0:
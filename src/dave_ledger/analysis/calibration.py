@@ -0,0 +1,217 @@
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from dave_ledger.core import config, paths
+from .history import player_seasons
+
+logger = logging.getLogger(__name__)
+
+# Parameter grids. Each position scores every grid point in one broadcast.
+END_AGES = np.arange(20, 31)
+START_AGES = np.arange(24, 41)
+GROWTH_RATES = np.round(np.arange(0.0, 0.301, 0.01), 3)
+DECAY_RATES = np.round(np.arange(0.0, 0.401, 0.01), 3)
+CLIFF_AGES = np.arange(26.0, 46.01, 0.25)
+STEEPNESS = np.round(np.arange(0.1, 2.001, 0.05), 3)
+
+# A best fit on either end of its grid means the data did not pin the parameter down
+GRIDS = {
+    'end_age': END_AGES,
+    'growth_rate': GROWTH_RATES,
+    'start_age': START_AGES,
+    'decay_rate': DECAY_RATES,
+    'cliff_age': CLIFF_AGES,
+    'k': STEEPNESS,
+}
+
+
+def _age_bins(ages: np.ndarray, *values: np.ndarray):
+    """Sufficient statistics per integer age: returns (ages, sum of each value array)."""
+    ages = np.round(np.asarray(ages, dtype=float)).astype(int)
+    uniq, inv = np.unique(ages, return_inverse=True)
+    sums = [np.bincount(inv, weights=np.asarray(v, dtype=float), minlength=len(uniq)) for v in values]
+    return uniq, sums
+
+
+def fit_performance_curve(ages: np.ndarray, ratios: np.ndarray, weights: np.ndarray) -> Dict[str, float]:
+    """
+    Fits the growth/decay step curve used by AssetValuator to year-over-year PPG ratios.
+
+    The multiplier at age a is 1+growth_rate if a <= end_age, 1-decay_rate if a >= start_age,
+    else 1. The Gaussian likelihood reduces to weighted SSE, which is separable by region,
+    so per-age sufficient statistics give every grid point's SSE via a few matrix products.
+    """
+    ratios = np.asarray(ratios, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    a, (w, s1, s2) = _age_bins(ages, weights, weights * ratios, weights * ratios ** 2)
+
+    def sse(mult: np.ndarray) -> np.ndarray:
+        # (len(mult) x ages): SSE contribution of every age at each multiplier
+        m = mult[:, None]
+        return w[None, :] * m ** 2 - 2 * m * s1[None, :] + s2[None, :]
+
+    in_growth = (a[None, :] <= END_AGES[:, None]).astype(float)          # E x A
+    in_decay = (a[None, :] >= START_AGES[:, None]).astype(float)         # S x A
+
+    growth_sse = in_growth @ sse(1.0 + GROWTH_RATES).T                   # E x G
+    decay_sse = in_decay @ sse(1.0 - DECAY_RATES).T                      # S x D
+    flat = sse(np.array([1.0]))[0]                                       # A
+    mid_sse = (1 - in_growth) @ flat[:, None] - (1 - in_growth) @ (in_decay.T * flat[:, None])  # E x S
+
+    total = (growth_sse[:, None, :, None]
+             + mid_sse[:, :, None, None]
+             + decay_sse[None, :, None, :])
+    total[~(START_AGES[None, :] > END_AGES[:, None])] = np.inf
+
+    e, s, g, d = np.unravel_index(np.argmin(total), total.shape)
+    return {
+        'end_age': int(END_AGES[e]),
+        'growth_rate': float(GROWTH_RATES[g]),
+        'start_age': int(START_AGES[s]),
+        'decay_rate': float(DECAY_RATES[d]),
+    }
+
+
+def fit_retirement_curve(ages: np.ndarray, exited: np.ndarray) -> Dict[str, float]:
+    """
+    Fits the logistic exit curve P(exit | age) = 1 / (1 + exp(-k (age - cliff_age)))
+    by maximising the binomial log-likelihood over the (cliff_age x k) grid.
+    """
+    a, (n, e) = _age_bins(ages, np.ones(len(ages)), np.asarray(exited, dtype=float))
+
+    x = STEEPNESS[None, :, None] * (a[None, None, :] - CLIFF_AGES[:, None, None])   # C x K x A
+    x = np.clip(x, -100, 100)
+    log_p = -np.logaddexp(0.0, -x)      # log sigmoid(x)
+    log_q = -np.logaddexp(0.0, x)       # log (1 - sigmoid(x))
+    loglik = (e * log_p + (n - e) * log_q).sum(axis=2)
+
+    c, k = np.unravel_index(np.argmax(loglik), loglik.shape)
+    return {'cliff_age': float(CLIFF_AGES[c]), 'k': float(STEEPNESS[k])}
+
+
+def _interior(pos: str, fit: Dict[str, float]) -> Optional[Dict[str, float]]:
+    """
+    Returns the fitted curve only if none of its parameters landed on a grid edge.
+    Each curve is a pair (region boundary + rate): half of one, merged over the configured
+    other half, would apply a rate fitted for one region to a different one.
+    """
+    edges = [name for name, value in fit.items()
+             if np.isclose(value, GRIDS[name][0]) or np.isclose(value, GRIDS[name][-1])]
+    if edges:
+        shown = ", ".join(f"{name} = {fit[name]}" for name in edges)
+        logger.warning(f"⚠️ {pos}: {shown} on the edge of its grid; {'/'.join(fit)} not calibrated")
+        return None
+    return fit
+
+
+def _yoy_pairs(ps: pd.DataFrame, min_games: int) -> pd.DataFrame:
+    """Consecutive player-seasons with enough games on both sides to trust the PPG ratio."""
+    nxt = ps[['player_id', 'season', 'ppg', 'active_games', 'age']].copy()
+    nxt['season'] -= 1
+    pairs = ps.merge(nxt, on=['player_id', 'season'], suffixes=('', '_next'))
+    pairs = pairs[(pairs['active_games'] >= min_games) & (pairs['active_games_next'] >= min_games) & (pairs['ppg'] >= 1.0)]
+    pairs = pairs.assign(
+        ratio=(pairs['ppg_next'] / pairs['ppg']).clip(0.0, 3.0),
+        weight=np.minimum(pairs['active_games'], pairs['active_games_next']),
+    )
+    return pairs
+
+
+def _exit_exposures(ps: pd.DataFrame, min_games: int) -> pd.DataFrame:
+    """
+    Every contributing player-season that has an observable following season.
+    `exited` = the player never appears again; the event is scored at next season's age,
+    which is the age the valuator's survival curve uses for that year.
+    """
+    last_season = ps['season'].max()
+    last_seen = ps.groupby('player_id')['season'].transform('max')
+    exp = ps[(ps['season'] < last_season) & (ps['active_games'] >= min_games)].copy()
+    exp['exited'] = (last_seen.loc[exp.index] == exp['season']).astype(float)
+    exp['event_age'] = exp['age'] + 1
+    return exp
+
+
+def fit_aging_curves(
+    df: pd.DataFrame,
+    cfg: Dict[str, Any],
+    min_games: int = 4,
+    min_obs: int = 30,
+    min_exits: int = 20,
+) -> Dict[str, Any]:
+    """
+    Calibrates performance_growth, performance_decay and retirement_risk per position
+    from multi-season history. Returns a `local.yaml`-style overlay; positions with
+    fewer than `min_obs` observations (or `min_exits` exit events for the retirement
+    curve) are left out, as is any curve with a parameter whose best fit sits on its
+    grid edge, so the existing values stand.
+    """
+    ps = player_seasons(df, cfg).dropna(subset=['age'])
+    pairs = _yoy_pairs(ps, min_games)
+    exits = _exit_exposures(ps, min_games)
+
+    growth, decay, retire = {}, {}, {}
+    for pos in sorted(ps['fantasy_group'].dropna().unique()):
+        p = pairs[pairs['fantasy_group'] == pos]
+        if len(p) >= min_obs:
+            fit = fit_performance_curve(p['age_next'], p['ratio'], p['weight'])
+            logger.info(f"📈 {pos}: growth to {fit['end_age']} @ {fit['growth_rate']:.2f}, "
+                        f"decay from {fit['start_age']} @ {fit['decay_rate']:.2f} ({len(p)} pairs)")
+            g = _interior(pos, {'end_age': fit['end_age'], 'growth_rate': fit['growth_rate']})
+            d = _interior(pos, {'start_age': fit['start_age'], 'decay_rate': fit['decay_rate']})
+            if g:
+                growth[pos] = g
+            if d:
+                decay[pos] = d
+
+        x = exits[exits['fantasy_group'] == pos]
+        n_exits = int(x['exited'].sum())
+        if len(x) >= min_obs and n_exits >= min_exits:
+            fit = fit_retirement_curve(x['event_age'], x['exited'])
+            logger.info(f"🚪 {pos}: cliff {fit['cliff_age']:.2f}, k {fit['k']:.2f} "
+                        f"({n_exits} exits / {len(x)})")
+            r = _interior(pos, fit)
+            if r:
+                retire[pos] = r
+        elif len(x) >= min_obs:
+            logger.warning(f"⚠️ {pos}: only {n_exits} exits in {len(x)} seasons; retirement curve not calibrated")
+
+    val = {}
+    if growth:
+        val['performance_growth'] = growth
+    if decay:
+        val['performance_decay'] = decay
+    if retire:
+        val['retirement_risk'] = retire
+    return {'valuation': val} if val else {}
+
+
+def write_overlay(overlay: Dict[str, Any], path: Optional[Path] = None) -> Path:
+    """
+    Merges the overlay into config/local.yaml (or `path`), keeping any keys already there,
+    and writes it atomically so a concurrent load_config never sees half a file.
+    """
+    path = Path(path) if path else paths.config_dir() / "local.yaml"
+    existing = config._read_yaml(path)
+    merged = config._deep_merge(existing, overlay)
+
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(yaml.safe_dump(merged, sort_keys=False, default_flow_style=None))
+    tmp.replace(path)
+    logger.info(f"✅ Calibrated overlay written to {path}")
+    return path
+
+
+if __name__ == "__main__":
+    # Allows running `python -m dave_ledger.analysis.calibration` from terminal
+    from dave_ledger.core import scoring
+    from dave_ledger.etl import transform
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    cfg = config.load_config()
+    df = scoring.apply_fantasy_scoring(transform.load_and_clean_data(), cfg['scoring'])
+    write_overlay(fit_aging_curves(df, cfg))
@@ -0,0 +1,208 @@
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .history import player_seasons
+
+logger = logging.getLogger(__name__)
+
+
+class TrajectoryIndex:
+    """
+    Exact k-nearest-neighbour index over fixed-length vectors, blocked by position.
+    Distances are computed a block of queries at a time as |q|^2 + |x|^2 - 2 q.x,
+    so one batched query is a handful of matrix products per position.
+    """
+
+    def __init__(self, vectors: np.ndarray, groups: np.ndarray, owners: np.ndarray, block_size: int = 2048):
+        self.vectors = np.asarray(vectors, dtype=float)
+        self.groups = np.asarray(groups, dtype=object)
+        self.owners = np.asarray(owners, dtype=object)
+        self.block_size = block_size
+        self._members = {g: np.flatnonzero(self.groups == g) for g in pd.unique(self.groups)}
+        self._sq_norms = (self.vectors ** 2).sum(axis=1)
+
+    def query(self, queries: np.ndarray, groups: np.ndarray, owners: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (indices, distances), each (n_queries x k), nearest first.
+        Only same-position candidates are eligible and a query never matches its own owner.
+        Missing neighbours are reported as index -1 / distance inf.
+        """
+        queries = np.asarray(queries, dtype=float)
+        groups = np.asarray(groups, dtype=object)
+        owners = np.asarray(owners, dtype=object)
+        out_idx = np.full((len(queries), k), -1, dtype=int)
+        out_dist = np.full((len(queries), k), np.inf)
+
+        for g in pd.unique(groups):
+            members = self._members.get(g)
+            if members is None or len(members) == 0:
+                continue
+            X = self.vectors[members]
+            x_sq = self._sq_norms[members]
+            q_rows = np.flatnonzero(groups == g)
+            kk = min(k, len(members))
+
+            for start in range(0, len(q_rows), self.block_size):
+                rows = q_rows[start:start + self.block_size]
+                Q = queries[rows]
+                d2 = (Q ** 2).sum(axis=1)[:, None] + x_sq[None, :] - 2.0 * Q @ X.T
+                d2[owners[rows][:, None] == self.owners[members][None, :]] = np.inf
+                np.maximum(d2, 0.0, out=d2)
+
+                part = np.argpartition(d2, kk - 1, axis=1)[:, :kk]
+                part_d = np.take_along_axis(d2, part, axis=1)
+                order = np.argsort(part_d, axis=1)
+                best = np.take_along_axis(part, order, axis=1)
+                best_d = np.sqrt(np.take_along_axis(part_d, order, axis=1))
+
+                found = np.isfinite(best_d)
+                out_idx[rows, :kk] = np.where(found, members[best], -1)
+                out_dist[rows, :kk] = best_d
+
+        return out_idx, out_dist
+
+
+class CompsEngine:
+    """
+    Career-trajectory comparables.
+
+    Every player-season becomes an age-aligned vector of the last `length` seasons of
+    PPG, availability and an in-league flag, plus the age at that season. Only seasons
+    whose whole window lies inside the loaded history are used: before the first loaded
+    season a veteran's record is unknown, not zero. Historical vectors with known
+    follow-up seasons are indexed; every active player is matched in one batched query,
+    and the comps' realised year-over-year PPG ratios become projection multipliers.
+    """
+
+    def __init__(self, df: pd.DataFrame, cfg: Dict[str, Any], k: Optional[int] = None,
+                 length: Optional[int] = None, horizon: Optional[int] = None):
+        comps_cfg = cfg.get('valuation', {}).get('comps', {}) or {}
+        self.cfg = cfg
+        self.k = k or comps_cfg.get('k', 10)
+        self.length = length or comps_cfg.get('length', 3)
+        self.horizon = horizon or comps_cfg.get('horizon', 3)
+        self.min_comps = comps_cfg.get('min_comps', 3)
+        self.min_games = comps_cfg.get('min_games', 4)
+        self.age_weight = comps_cfg.get('age_weight', 2.0)
+        self.max_ratio = comps_cfg.get('max_ratio', 3.0)
+
+        self.seasons_df = player_seasons(df, cfg)
+        self._build()
+
+    def _build(self):
+        ps = self.seasons_df
+        seasons = np.sort(ps['season'].unique())
+        players, p_codes = np.unique(ps['player_id'].to_numpy(dtype=object), return_inverse=True)
+        s_codes = np.searchsorted(seasons, ps['season'].to_numpy())
+        n_p, n_s, L = len(players), len(seasons), self.length
+
+        ppg = np.full((n_p, n_s), np.nan)
+        avail = np.zeros((n_p, n_s))
+        games = np.zeros((n_p, n_s))
+        ppg[p_codes, s_codes] = ps['ppg'].to_numpy(dtype=float)
+        avail[p_codes, s_codes] = ps['availability'].to_numpy(dtype=float)
+        games[p_codes, s_codes] = ps['active_games'].to_numpy(dtype=float)
+
+        # In league from the first season seen: a missed season after that is a gap
+        # (in_league 1, zero PPG), while seasons before it are pre-debut (in_league 0)
+        first_seen = (~np.isnan(ppg)).argmax(axis=1)
+        in_league = (np.arange(n_s)[None, :] >= first_seen[:, None]).astype(float)
+
+        # Age-aligned windows; the left pad only keeps indexing simple, since anchors
+        # whose window reaches before the first loaded season are never used
+        pad = np.zeros((n_p, L - 1))
+        ppg_pad = np.concatenate([pad, np.nan_to_num(ppg)], axis=1)
+        avail_pad = np.concatenate([pad, avail], axis=1)
+        league_pad = np.concatenate([pad, in_league], axis=1)
+        cols = s_codes[:, None] + np.arange(L)[None, :]
+        traj_ppg = ppg_pad[p_codes[:, None], cols]
+        traj_avail = avail_pad[p_codes[:, None], cols]
+        traj_league = league_pad[p_codes[:, None], cols]
+        age = ps['age'].to_numpy(dtype=float)
+
+        features = np.concatenate(
+            [traj_ppg, traj_avail, traj_league, np.nan_to_num(age, nan=np.nanmedian(age))[:, None]], axis=1
+        )
+        scale = features.std(axis=0)
+        scale[scale == 0] = 1.0
+        features = features / scale
+        features[:, -1] *= self.age_weight
+
+        # Year-over-year PPG ratios after each anchor season (NaN if the season is missing/thin)
+        ratios = np.full((len(ps), self.horizon), np.nan)
+        ok = games >= self.min_games
+        for h in range(1, self.horizon + 1):
+            prev_s, next_s = s_codes + h - 1, s_codes + h
+            in_range = next_s < n_s
+            prev_c, next_c = np.minimum(prev_s, n_s - 1), np.minimum(next_s, n_s - 1)
+            num, den = ppg[p_codes, next_c], ppg[p_codes, prev_c]
+            valid = in_range & ok[p_codes, prev_c] & ok[p_codes, next_c] & (den >= 1.0)
+            ratios[valid, h - 1] = np.clip(num[valid] / den[valid], 0.0, self.max_ratio)
+
+        self.features = features
+        self.ratios = ratios
+        self._full_window = s_codes >= L - 1
+        self._has_future = s_codes < n_s - 1
+        self._latest_season = seasons[-1]
+
+        hist = np.flatnonzero(self._has_future & self._full_window)
+        self.index = TrajectoryIndex(
+            features[hist],
+            ps['fantasy_group'].to_numpy(dtype=object)[hist],
+            ps['player_id'].to_numpy(dtype=object)[hist],
+        )
+        self._hist_rows = hist
+
+    def _query_active(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        ps = self.seasons_df
+        rows = np.flatnonzero(
+            (ps['season'] == self._latest_season).to_numpy()
+            & (ps['active_games'] > 0).to_numpy()
+            & self._full_window
+        )
+        idx, dist = self.index.query(
+            self.features[rows],
+            ps['fantasy_group'].to_numpy(dtype=object)[rows],
+            ps['player_id'].to_numpy(dtype=object)[rows],
+            self.k,
+        )
+        return rows, idx, dist
+
+    def query(self) -> pd.DataFrame:
+        """k nearest historical comps for every active player (long format, rank 1 = closest)."""
+        ps = self.seasons_df
+        rows, idx, dist = self._query_active()
+        q, r = np.nonzero(idx >= 0)
+        comp_rows = self._hist_rows[idx[q, r]]
+        return pd.DataFrame({
+            'player_id': ps['player_id'].to_numpy()[rows[q]],
+            'rank': r + 1,
+            'comp_player_id': ps['player_id'].to_numpy()[comp_rows],
+            'comp_season': ps['season'].to_numpy()[comp_rows],
+            'comp_age': ps['age'].to_numpy()[comp_rows],
+            'distance': dist[q, r],
+        })
+
+    def multipliers(self) -> pd.DataFrame:
+        """
+        Comp-derived PPG multipliers, one column per projected year (year_1..year_H).
+        NaN where fewer than `min_comps` comps have that follow-up season.
+        """
+        ps = self.seasons_df
+        rows, idx, _ = self._query_active()
+        comp_ratios = np.where(
+            (idx >= 0)[:, :, None],
+            self.ratios[self._hist_rows[np.maximum(idx, 0)]],
+            np.nan,
+        )
+        counts = np.isfinite(comp_ratios).sum(axis=1)
+        with np.errstate(all='ignore'):
+            med = np.nanmedian(np.where(counts[:, None, :] > 0, comp_ratios, 0.0), axis=1)
+        med[counts < self.min_comps] = np.nan
+
+        out = pd.DataFrame(med, columns=[f'year_{h}' for h in range(1, self.horizon + 1)])
+        out.insert(0, 'player_id', ps['player_id'].to_numpy()[rows])
+        return out.set_index('player_id')
@@ -0,0 +1,55 @@
+import logging
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def active_game_mask(df: pd.DataFrame) -> pd.Series:
+    """
+    Vectorized form of AssetValuator._is_active_game over a whole frame.
+    Active = any offensive/defensive snaps, or any non-zero fantasy score.
+    """
+    mask = pd.Series(False, index=df.index)
+    for col in ['offense_pct', 'defense_pct']:
+        if col in df.columns:
+            mask |= df[col].fillna(0) > 0
+    if 'fantasy_points' in df.columns:
+        mask |= df['fantasy_points'].fillna(0).abs() > 0
+    return mask
+
+
+def player_seasons(df: pd.DataFrame, cfg: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Collapses weekly history into one row per player-season.
+
+    Columns: player_id, season, fantasy_group, age, games, active_games, ppg, availability.
+    `age` follows transform.py's current_age convention (season + 1 - birth_year),
+    which is the age the valuation curves are evaluated at for that season.
+    """
+    current_year = cfg['context']['current_year']
+    df = df.copy()
+    if 'fantasy_group' not in df.columns:
+        df['fantasy_group'] = df['position']
+    if 'birth_year' not in df.columns:
+        df['birth_year'] = (current_year + 1) - df['current_age']
+
+    active = active_game_mask(df)
+    df['_active'] = active.astype(float)
+    df['_active_pts'] = df['fantasy_points'].fillna(0).where(active, 0.0)
+
+    df = df.sort_values(['season', 'week'], kind='stable')
+    out = df.groupby(['player_id', 'season'], sort=True).agg(
+        fantasy_group=('fantasy_group', 'last'),
+        birth_year=('birth_year', 'last'),
+        games=('week', 'size'),
+        active_games=('_active', 'sum'),
+        active_pts=('_active_pts', 'sum'),
+    ).reset_index()
+
+    out['age'] = (out['season'] + 1) - out['birth_year'].astype(float)
+    out['ppg'] = np.where(out['active_games'] > 0, out['active_pts'] / out['active_games'].clip(lower=1), np.nan)
+    out['availability'] = (out['active_games'] / 17).clip(upper=1.0)
+    return out.drop(columns=['active_pts', 'birth_year'])
@@ -0,0 +1,86 @@
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+DECISIONS = ['score', 'shield', 'handcuff', 'cut']
+
+# Small row groups keep per-player reads cheap: the ledger is sorted by player_id,
+# so parquet min/max statistics let a filtered read skip almost every group.
+ROW_GROUP_SIZE = 8192
+
+
+def build_ledger(
+    player_ids: np.ndarray,
+    terms: Dict[str, np.ndarray],
+    availability: np.ndarray,
+    floors: np.ndarray,
+    current_year: int,
+) -> pa.Table:
+    """
+    Long-format cashflow ledger: one row per player per projected year that
+    contributed to dcf_value, plus the year a player is cut (pv = 0).
+
+    Built straight from the (players x years) projection arrays with one
+    gather, so the cost is a handful of array copies regardless of universe size.
+    """
+    alive = terms['alive']
+    stop = ~alive
+    first_stop = stop & (np.cumsum(stop, axis=1) == 1)
+    cut_row = first_stop & terms['is_cut'] & ~terms['is_exit']
+
+    pi, yi = np.nonzero(alive | cut_row)
+
+    ids = np.asarray(player_ids).astype(str)[pi]
+    order = np.argsort(ids, kind='stable')
+    pi, yi, ids = pi[order], yi[order], ids[order]
+
+    floors = np.asarray(floors, dtype=float)
+    ppg = terms['ppg'][pi, yi]
+    is_cut = cut_row[pi, yi]
+    shielded = (ppg < floors[pi]) & terms['is_young'][pi, yi]
+    decision = np.select(
+        [is_cut, terms['is_handcuff'][pi, yi], shielded],
+        [3, 2, 1],
+        default=0,
+    ).astype(np.int8)
+
+    pv = np.where(is_cut, 0.0, terms['pv'][pi, yi])
+    year = (yi + 1).astype(np.int16)
+
+    return pa.table({
+        'player_id': pa.array(ids),
+        'year': year,
+        'season': (current_year + year).astype(np.int16),
+        'age': terms['future_age'][pi, yi].astype(np.float32),
+        'survival': terms['survival'][pi, yi].astype(np.float32),
+        'availability': np.asarray(availability, dtype=float)[pi].astype(np.float32),
+        'ppg': ppg.astype(np.float32),
+        'scoring_ppg': np.where(is_cut, 0.0, terms['scoring_ppg'][pi, yi]).astype(np.float32),
+        'decision': pa.DictionaryArray.from_arrays(decision, pa.array(DECISIONS)),
+        'discount_factor': (1.0 / terms['discount'][yi]).astype(np.float32),
+        'pv': pv,
+    })
+
+
+def write_ledger(table: pa.Table, path: Path) -> Path:
+    """Writes the ledger parquet atomically (write to a temp file, then rename)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    pq.write_table(table, tmp, row_group_size=ROW_GROUP_SIZE, compression='zstd')
+    tmp.replace(path)
+    logger.info(f"   -> Ledger: {table.num_rows:,} player-years written to {path.name}")
+    return path
+
+
+def read_ledger(path: Path, player_ids: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Reads the ledger, optionally only for some players (row groups are pruned by statistics)."""
+    filters = [('player_id', 'in', list(player_ids))] if player_ids is not None else None
+    return pd.read_parquet(path, filters=filters)
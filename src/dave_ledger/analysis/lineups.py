@@ -0,0 +1,83 @@
+import logging
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Which fantasy groups may fill each flex slot (override with league.flex_eligibility)
+FLEX_ELIGIBILITY = {
+    'FLEX': ['RB', 'WR', 'TE'],
+    'SUPERFLEX': ['QB', 'RB', 'WR', 'TE'],
+    'IDP_FLEX': ['DL', 'LB', 'DB'],
+}
+
+
+def flex_eligibility(cfg: Dict[str, Any]) -> Dict[str, list]:
+    """Flex slot -> eligible fantasy groups: the defaults plus any league.flex_eligibility."""
+    return {**FLEX_ELIGIBILITY, **cfg['league'].get('flex_eligibility', {})}
+
+
+def solve_lineups(df: pd.DataFrame, cfg: Dict[str, Any]) -> pd.DataFrame:
+    """
+    League-wide optimal starters for every week in `df`, solved for all weeks at once.
+
+    Each week the league needs num_teams x starters[slot] players per slot. Dedicated
+    slots take the top scorers of their position; flex slots are then filled from the
+    best remaining eligible players, narrowest eligibility first. With nested flex
+    eligibility (FLEX within SUPERFLEX) this greedy order is optimal, and every step
+    is a single rank-within-week pass over the whole history reusing one sort.
+
+    Returns one row per starter: season, week, player_id, fantasy_group, fantasy_points, slot.
+    """
+    league = cfg['league']
+    teams = league['num_teams']
+    starters = {k: v for k, v in league['starters'].items() if v}
+    eligibility = flex_eligibility(cfg)
+
+    cols = ['season', 'week', 'player_id', 'fantasy_group', 'fantasy_points']
+    group_col = 'fantasy_group' if 'fantasy_group' in df.columns else 'position'
+    w = df[['season', 'week', 'player_id', group_col, 'fantasy_points']].rename(columns={group_col: 'fantasy_group'})
+    w = w.assign(fantasy_points=w['fantasy_points'].fillna(0.0))
+
+    # One sort: within each week, best score first. Every later rank reuses this order.
+    w = w.sort_values(['season', 'week', 'fantasy_points'], ascending=[True, True, False], kind='stable')
+    w = w.reset_index(drop=True)
+    slot = np.full(len(w), '', dtype=object)
+
+    # 1. Dedicated slots: top-N of each position per week
+    dedicated = {k: v for k, v in starters.items() if k not in eligibility}
+    if dedicated:
+        pos_rank = w.groupby(['season', 'week', 'fantasy_group'], sort=False).cumcount().to_numpy()
+        demand = w['fantasy_group'].map({k: teams * v for k, v in dedicated.items()}).fillna(0).to_numpy()
+        take = pos_rank < demand
+        slot[take] = w['fantasy_group'].to_numpy(dtype=object)[take]
+
+    # 2. Flex slots, narrowest eligibility first
+    flex_slots = sorted((k for k in starters if k in eligibility), key=lambda k: len(eligibility[k]))
+    groups = w['fantasy_group'].to_numpy(dtype=object)
+    for name in flex_slots:
+        open_rows = np.flatnonzero((slot == '') & np.isin(groups, eligibility[name]))
+        if len(open_rows) == 0:
+            continue
+        sub = w.iloc[open_rows]
+        rank = sub.groupby(['season', 'week'], sort=False).cumcount().to_numpy()
+        slot[open_rows[rank < teams * starters[name]]] = name
+
+    filled = slot != ''
+    starters_df = w.loc[filled, cols].copy()
+    starters_df['slot'] = slot[filled]
+    return starters_df.reset_index(drop=True)
+
+
+def flex_composition(lineups: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    """Share of each flex slot's starts taken by each position, e.g. {'FLEX': {'WR': 0.7, ...}}."""
+    # Dedicated slots are named after their position, so anything else is a flex start
+    flex = lineups[lineups['slot'] != lineups['fantasy_group']]
+    counts = flex.groupby(['slot', 'fantasy_group']).size()
+    shares: Dict[str, Dict[str, float]] = {}
+    for slot_name, sub in counts.groupby(level=0):
+        total = sub.sum()
+        shares[slot_name] = {pos: float(n / total) for (_, pos), n in sub.items()}
+    return shares
@@ -3,8 +3,13 @@ import numpy as np
 from typing import Dict, Any, Optional
 import logging
 
+from .comps import CompsEngine
+from .history import active_game_mask
+from .ledger import build_ledger
+
 logger = logging.getLogger(__name__)
 
+
 class AssetValuator:
     def __init__(self, df: pd.DataFrame, config: Dict[str, Any], baselines: Optional[Dict[str, float]] = None):
         self.df = df
@@ -38,6 +43,16 @@ class AssetValuator:
         self.growth_params = val_cfg.get('performance_growth', {})
         self.default_growth = {'end_age': 25, 'growth_rate': 0.05}
 
+        # 7. Optional: comp-derived growth/decay instead of the flat curves
+        self.comps_cfg = val_cfg.get('comps', {}) or {}
+
+        # 8. Optional: year-by-year cashflow ledger (see analysis/ledger.py)
+        self.emit_ledger = val_cfg.get('emit_ledger', False)
+        self.ledger = None
+
+        # 9. Optional: parameter sensitivities of dcf_value / vorp (see _sensitivities)
+        self.emit_sensitivities = val_cfg.get('sensitivities', False)
+
     def run_valuation(self) -> pd.DataFrame:
         df = self.df.copy()
         if 'fantasy_group' not in df.columns:
@@ -139,94 +154,217 @@ class AssetValuator:
         df['risk_cv'] = df['player_id'].map(stats['risk_cv'])
         return df
 
+    def _group_param(self, groups: np.ndarray, params: Dict[str, Dict], default: Dict, key: str, fallback: float) -> np.ndarray:
+        """Broadcasts a per-position curve parameter onto an array of fantasy groups."""
+        lookup = {g: params.get(g, default).get(key, fallback) for g in pd.unique(groups)}
+        return np.array([lookup[g] for g in groups], dtype=float)
+
+    def _projection_terms(
+        self,
+        talent_ppg: np.ndarray,
+        availability: np.ndarray,
+        age: np.ndarray,
+        years_exp: np.ndarray,
+        groups: np.ndarray,
+        floors: np.ndarray,
+        perf_override: Optional[np.ndarray] = None,
+        max_years: int = 15,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Batched version of the year-by-year DCF loop.
+        Every array is (players x years); 'alive' marks the years that count towards dcf_value.
+        `perf_override` (players x n) replaces the curve multiplier for the first n years
+        wherever it is finite (comp-derived projections).
+        """
+        ppg0 = np.asarray(talent_ppg, dtype=float)
+        avail = np.asarray(availability, dtype=float)
+        groups = np.asarray(groups, dtype=object)
+        floors = np.asarray(floors, dtype=float)[:, None]
+        years = np.arange(1, max_years + 1, dtype=float)
+
+        future_age = np.asarray(age, dtype=float)[:, None] + years
+        future_exp = np.asarray(years_exp, dtype=float)[:, None] + years
+
+        # A. Retirement (Exit) - logistic S-curve, cumulative survival
+        cliff = self._group_param(groups, self.retire_params, self.default_retire, 'cliff_age', 34.0)[:, None]
+        k = self._group_param(groups, self.retire_params, self.default_retire, 'k', 0.6)[:, None]
+        exponent = np.clip(k * (future_age - cliff), -100, 100)
+        prob_retire = 1.0 / (1.0 + np.exp(-exponent))
+        survival = np.cumprod(1.0 - prob_retire, axis=1)
+
+        # B. Performance (Growth/Decay) - compounding multiplier on PPG
+        end_age = self._group_param(groups, self.growth_params, self.default_growth, 'end_age', 25)[:, None]
+        growth = self._group_param(groups, self.growth_params, self.default_growth, 'growth_rate', 0.05)[:, None]
+        start_age = self._group_param(groups, self.decay_params, self.default_decay, 'start_age', 30)[:, None]
+        decay = self._group_param(groups, self.decay_params, self.default_decay, 'decay_rate', 0.10)[:, None]
+        is_growth = future_age <= end_age
+        is_decay = ~is_growth & (future_age >= start_age)
+        perf_mult = np.where(is_growth, 1.0 + growth, np.where(is_decay, 1.0 - decay, 1.0))
+        if perf_override is not None:
+            n = min(perf_override.shape[1], max_years)
+            use = np.zeros_like(is_growth)
+            use[:, :n] = np.isfinite(perf_override[:, :n])
+            perf_mult[:, :n] = np.where(use[:, :n], perf_override[:, :n], perf_mult[:, :n])
+            is_growth &= ~use
+            is_decay &= ~use
+        ppg = ppg0[:, None] * np.cumprod(perf_mult, axis=1)
+
+        # C. Logic Gates (Shields & Handcuffs)
+        is_young = (future_age <= 23) | (future_exp < 3)
+        below_floor = (ppg < floors) & ~is_young
+        is_handcuff = below_floor & (groups == 'RB')[:, None] & (ppg > 2.0)
+        is_cut = below_floor & ~is_handcuff
+        scoring_ppg = np.where(is_handcuff, floors * 0.10, ppg)
+
+        # D. Value Calculation
+        discount = (1 + self.discount_rate) ** years
+        pv = (scoring_ppg * avail[:, None] * 17) * survival / discount
+
+        # A year counts only if no stop condition has fired in it or any earlier year
+        is_exit = survival < 0.05
+        stop = is_exit | is_cut | (pv < self.epsilon_val)
+        alive = np.cumsum(stop, axis=1) == 0
+
+        return {
+            'future_age': future_age,
+            'survival': survival,
+            'prob_retire': prob_retire,
+            'ppg': ppg,
+            'scoring_ppg': scoring_ppg,
+            'is_growth': is_growth,
+            'is_decay': is_decay,
+            'is_young': is_young,
+            'is_handcuff': is_handcuff,
+            'is_cut': is_cut,
+            'is_exit': is_exit,
+            'discount': discount,
+            'pv': pv,
+            'alive': alive,
+        }
+
+    def project_dcf(
+        self,
+        talent_ppg: np.ndarray,
+        availability: np.ndarray,
+        age: np.ndarray,
+        years_exp: np.ndarray,
+        groups: np.ndarray,
+        floors: np.ndarray,
+        perf_override: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Infinite-horizon DCF value for a batch of players (see _projection_terms)."""
+        terms = self._projection_terms(talent_ppg, availability, age, years_exp, groups, floors, perf_override)
+        return np.where(terms['alive'], terms['pv'], 0.0).sum(axis=1)
+
     def _project_infinite_horizon(self, df: pd.DataFrame) -> pd.DataFrame:
-        
-        def get_active_prob(group, age):
-            params = self.retire_params.get(group, self.default_retire)
-            cliff = params.get('cliff_age', 34.0)
-            k = params.get('k', 0.6)
-            
-            # --- FIX: S-Curve Correction ---
-            # We want prob_retire to INCREASE as age increases.
-            exponent = k * (age - cliff)
-            exponent = max(min(exponent, 100), -100)
-            
-            # Use negative exponent: 1 / (1 + e^-x) -> goes to 1 as x increases
-            prob_retire = 1.0 / (1.0 + np.exp(-exponent)) 
-            
-            return 1.0 - prob_retire
+        groups = df['fantasy_group'].to_numpy(dtype=object)
+        floors = np.array([self.baselines.get(g, 0.0) for g in groups], dtype=float)
+        years_exp = df['years_exp'] if 'years_exp' in df.columns else pd.Series(5, index=df.index)
 
-        def get_performance_multiplier(group, age):
-            # 1. Growth
-            g_params = self.growth_params.get(group, self.default_growth)
-            if age <= g_params.get('end_age', 25):
-                return 1.0 + g_params.get('growth_rate', 0.05)
-            
-            # 2. Decay
-            d_params = self.decay_params.get(group, self.default_decay)
-            if age >= d_params.get('start_age', 30):
-                return 1.0 - d_params.get('decay_rate', 0.10)
-                
-            return 1.0
-
-        def get_dcf(row):
-            current_ppg = row['talent_ppg']
-            availability = row['availability_score']
-            age = row['current_age']
-            start_exp = row.get('years_exp', 5) 
-            group = row['fantasy_group'] 
-            floor = self.baselines.get(group, 0.0)
-            
-            total_dcf = 0
-            year = 1
-            cumulative_survival = 1.0 
-            
-            while True:
-                future_age = age + year
-                future_exp = start_exp + year 
-                
-                # A. Retirement (Exit)
-                prob_return = get_active_prob(group, future_age)
-                cumulative_survival *= prob_return
-                
-                if cumulative_survival < 0.05: break
-                if year > 15: break
+        perf_override = None
+        if self.comps_cfg.get('enabled', False):
+            logger.info("   -> Matching Career Comps...")
+            multipliers = CompsEngine(self.df, self.cfg).multipliers()
+            perf_override = multipliers.reindex(df['player_id']).to_numpy(dtype=float)
 
-                # B. Performance (Growth/Decay)
-                perf_mult = get_performance_multiplier(group, future_age)
-                current_ppg *= perf_mult
-                
-                # C. Logic Gates (Shields & Handcuffs)
-                is_young = future_age <= 23 or future_exp < 3 
-                is_handcuff = (group == 'RB') and (current_ppg < floor) and (current_ppg > 2.0)
-                
-                scoring_ppg = current_ppg
-                if scoring_ppg < floor and not is_young:
-                    if is_handcuff:
-                        scoring_ppg = floor * 0.10 
-                    else:
-                        break # Cut
-                
-                # D. Value Calculation
-                annual_ev = (scoring_ppg * availability * 17) * cumulative_survival
-                pv = annual_ev / ((1 + self.discount_rate) ** year)
-                
-                if pv < self.epsilon_val: break
-                total_dcf += pv
-                year += 1
-                
-            return total_dcf
+        availability = df['availability_score'].to_numpy(dtype=float, na_value=np.nan)
+        terms = self._projection_terms(
+            df['talent_ppg'].to_numpy(dtype=float, na_value=np.nan),
+            availability,
+            df['current_age'].to_numpy(dtype=float, na_value=np.nan),
+            years_exp.to_numpy(dtype=float, na_value=np.nan),
+            groups,
+            floors,
+            perf_override,
+        )
+        df['dcf_value'] = np.where(terms['alive'], terms['pv'], 0.0).sum(axis=1)
 
-        df['dcf_value'] = df.apply(get_dcf, axis=1)
-        
-        def get_replacement_value(row):
-            floor = self.baselines.get(row['fantasy_group'], 0.0)
-            val = 0
-            for i in range(1, 4):
-                 val += (floor * 17) / ((1 + self.discount_rate) ** i)
-            return val
-
-        df['replacement_value'] = df.apply(get_replacement_value, axis=1)
+        if self.emit_ledger:
+            logger.info("   -> Building Cashflow Ledger...")
+            self.ledger = build_ledger(
+                df['player_id'].to_numpy(), terms, availability, floors, self.cfg['context']['current_year']
+            )
+
+        # Replacement player: 3 years at the baseline, no decay or exit risk
+        annuity = sum(17 / ((1 + self.discount_rate) ** i) for i in range(1, 4))
+        df['replacement_value'] = floors * annuity
         df['vorp'] = df['dcf_value'] - df['replacement_value']
-        
+
+        if self.emit_sensitivities:
+            logger.info("   -> Differentiating Valuations...")
+            sens = self._sensitivities(df, terms, groups, floors, availability)
+            df = df.assign(**sens)
+
         return df
+
+    def _sensitivities(
+        self,
+        df: pd.DataFrame,
+        terms: Dict[str, np.ndarray],
+        groups: np.ndarray,
+        floors: np.ndarray,
+        availability: np.ndarray,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Forward-mode derivatives of dcf_value and vorp w.r.t. discount_rate and each player's
+        own-position growth_rate, decay_rate, cliff_age, k, plus availability_weight.
+
+        Every derivative reuses the projection arrays already computed, so the cost is a few
+        extra (players x years) passes. Gates (cuts, handcuffs, epsilon stop) are held fixed:
+        these are the derivatives almost everywhere, not the size of a jump across a gate.
+        A parameter of another position has zero effect on a player, so one column per
+        parameter is the complete Jacobian.
+        """
+        alive = terms['alive']
+        pv = np.where(alive, terms['pv'], 0.0)
+        years = np.arange(1, pv.shape[1] + 1, dtype=float)
+        r = self.discount_rate
+
+        # Scoring PPG only moves with growth/decay when it is the projected PPG (not a handcuff floor)
+        ppg_pv = np.where(terms['is_handcuff'], 0.0, pv)
+
+        growth = self._group_param(groups, self.growth_params, self.default_growth, 'growth_rate', 0.05)[:, None]
+        decay = self._group_param(groups, self.decay_params, self.default_decay, 'decay_rate', 0.10)[:, None]
+        cliff = self._group_param(groups, self.retire_params, self.default_retire, 'cliff_age', 34.0)[:, None]
+        k = self._group_param(groups, self.retire_params, self.default_retire, 'k', 0.6)[:, None]
+
+        n_growth = np.cumsum(terms['is_growth'], axis=1)
+        n_decay = np.cumsum(terms['is_decay'], axis=1)
+        d_growth = ppg_pv * n_growth / (1.0 + growth)
+        d_decay = -ppg_pv * np.divide(n_decay, 1.0 - decay, out=np.zeros_like(pv), where=(1.0 - decay) != 0)
+
+        # d log(1 - sigmoid(x)) / dx = -sigmoid(x); flat where the exponent was clipped
+        offset = terms['future_age'] - cliff
+        sigma = np.where(np.abs(k * offset) < 100, terms['prob_retire'], 0.0)
+        d_cliff = pv * np.cumsum(sigma * k, axis=1)
+        d_k = -pv * np.cumsum(sigma * offset, axis=1)
+
+        # Availability = (played + prior * w) / (possible + w), capped at 1
+        active = active_game_mask(self.df)
+        hist = self.df.assign(_active=active.astype(float)).groupby('player_id')
+        played = df['player_id'].map(hist['_active'].sum()).to_numpy(dtype=float)
+        possible = df['player_id'].map(hist['season'].nunique() * 17).to_numpy(dtype=float)
+        prior = np.array([self.pos_priors.get(g, 0.90) for g in groups], dtype=float)
+        w = self.availability_weight
+        d_avail = (prior * possible - played) / (possible + w) ** 2
+        d_avail = np.where(availability < 1.0, d_avail, 0.0)
+        per_avail = np.divide(pv.sum(axis=1), availability, out=np.zeros(len(pv)), where=availability > 0)
+
+        d_dcf = {
+            'discount_rate': (pv * -years / (1.0 + r)).sum(axis=1),
+            'growth_rate': d_growth.sum(axis=1),
+            'decay_rate': d_decay.sum(axis=1),
+            'cliff_age': d_cliff.sum(axis=1),
+            'k': d_k.sum(axis=1),
+            'availability_weight': per_avail * d_avail,
+        }
+
+        # Only the replacement annuity depends on the discount rate
+        d_rep = floors * sum(-i * 17 / ((1 + r) ** (i + 1)) for i in range(1, 4))
+
+        out = {}
+        for name, d in d_dcf.items():
+            out[f'dcf_d_{name}'] = d
+        for name, d in d_dcf.items():
+            out[f'vorp_d_{name}'] = d - d_rep if name == 'discount_rate' else d
+        return out
@@ -2,6 +2,6 @@
 
 from .config import load_config
 from .paths import config_dir, find_repo_root
-from .scoring import apply_fantasy_scoring
+from .scoring import apply_fantasy_scoring, compile_scoring_rules
 
-__all__ = ["apply_fantasy_scoring", "config_dir", "find_repo_root", "load_config"]
+__all__ = ["apply_fantasy_scoring", "compile_scoring_rules", "config_dir", "find_repo_root", "load_config"]
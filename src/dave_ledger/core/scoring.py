@@ -1,18 +1,152 @@
 import pandas as pd
-from typing import Dict
+import numpy as np
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-def apply_fantasy_scoring(df: pd.DataFrame, rules: Dict[str, float]) -> pd.DataFrame:
+# Keys a rich (dict) rule may carry. Anything else is a typo in the config.
+RULE_KEYS = {'stat', 'per_unit', 'by_position', 'positions', 'threshold', 'bonus', 'tiers'}
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """One rich scoring rule, normalised so it can be applied as masks over a frame."""
+    name: str
+    stats: Tuple[str, ...]
+    per_unit: float = 0.0
+    by_position: Optional[Tuple[Tuple[str, float], ...]] = None
+    positions: Optional[Tuple[str, ...]] = None
+    thresholds: Tuple[float, ...] = ()
+    bonuses: Tuple[float, ...] = ()
+
+
+@dataclass(frozen=True)
+class ScoringPlan:
+    """Flat multipliers (the fast path) plus any rich rules, compiled once."""
+    flat: Dict[str, float]
+    rules: Tuple[CompiledRule, ...] = ()
+
+
+def _compile_rule(name: str, spec: Dict[str, Any]) -> CompiledRule:
+    unknown = set(spec) - RULE_KEYS
+    if unknown:
+        raise ValueError(f"Scoring rule '{name}' has unknown keys: {sorted(unknown)}")
+
+    stats = spec.get('stat', name)
+    stats = tuple(stats) if isinstance(stats, (list, tuple)) else (stats,)
+
+    positions = spec.get('positions')
+    if isinstance(positions, str):
+        positions = [positions]
+
+    by_position = spec.get('by_position')
+    if by_position is not None:
+        by_position = tuple((str(k), float(v)) for k, v in by_position.items())
+
+    # Threshold bonuses: a single {threshold, bonus} or a list of stacking tiers
+    tiers: List[Dict[str, float]] = list(spec.get('tiers', []))
+    for i, tier in enumerate(tiers):
+        if not isinstance(tier, dict) or set(tier) != {'threshold', 'bonus'}:
+            raise ValueError(f"Scoring rule '{name}' tier {i} must have exactly 'threshold' and 'bonus'.")
+    if 'threshold' in spec or 'bonus' in spec:
+        if 'threshold' not in spec or 'bonus' not in spec:
+            raise ValueError(f"Scoring rule '{name}' needs both 'threshold' and 'bonus'.")
+        tiers.append({'threshold': spec['threshold'], 'bonus': spec['bonus']})
+    tiers = sorted(tiers, key=lambda t: t['threshold'])
+
+    return CompiledRule(
+        name=name,
+        stats=stats,
+        per_unit=float(spec.get('per_unit', 0.0)),
+        by_position=by_position,
+        positions=tuple(positions) if positions else None,
+        thresholds=tuple(float(t['threshold']) for t in tiers),
+        bonuses=tuple(float(t['bonus']) for t in tiers),
+    )
+
+
+def compile_scoring_rules(rules: Dict[str, Any]) -> ScoringPlan:
+    """
+    Compiles the `scoring` config into a ScoringPlan.
+
+    A plain number is the classic `stat: multiplier` rule. A dict is a rich rule:
+      stat:        column (or list of columns, summed); defaults to the rule name
+      per_unit:    points per unit of the stat
+      by_position: {POS: per_unit} overrides, e.g. position-specific IDP tackles
+      positions:   only score rows whose fantasy_group is in this list
+      threshold/bonus: flat bonus once the stat reaches the threshold
+      tiers:       list of {threshold, bonus}; every tier crossed adds its bonus
+    """
+    flat: Dict[str, float] = {}
+    compiled: List[CompiledRule] = []
+    for name, spec in rules.items():
+        if isinstance(spec, dict):
+            compiled.append(_compile_rule(name, spec))
+        elif spec:
+            flat[name] = flat.get(name, 0.0) + float(spec)
+    return ScoringPlan(flat=flat, rules=tuple(compiled))
+
+
+def _apply_rich_rules(df: pd.DataFrame, rules: Tuple[CompiledRule, ...], total_points: np.ndarray) -> None:
+    """Adds every rich rule to total_points in place using boolean masks."""
+    pos_col = 'fantasy_group' if 'fantasy_group' in df.columns else 'position'
+    if pos_col not in df.columns:
+        if any(r.positions or r.by_position for r in rules):
+            raise ValueError("Position-conditional scoring needs a 'fantasy_group' or 'position' column.")
+        pos = None
+    else:
+        pos = df[pos_col]
+
+    stat_cache: Dict[Tuple[str, ...], np.ndarray] = {}
+    mask_cache: Dict[Tuple[str, ...], np.ndarray] = {}
+
+    for rule in rules:
+        present = [c for c in rule.stats if c in df.columns]
+        if not present:
+            continue
+
+        values = stat_cache.get(rule.stats)
+        if values is None:
+            values = df[present].fillna(0).to_numpy(dtype=float).sum(axis=1)
+            stat_cache[rule.stats] = values
+
+        points = np.zeros(len(df))
+        if rule.by_position is not None:
+            unit = pos.map(dict(rule.by_position)).fillna(rule.per_unit).to_numpy(dtype=float)
+            points += values * unit
+        elif rule.per_unit:
+            points += values * rule.per_unit
+
+        for threshold, bonus in zip(rule.thresholds, rule.bonuses):
+            points += np.where(values >= threshold, bonus, 0.0)
+
+        if rule.positions is not None:
+            mask = mask_cache.get(rule.positions)
+            if mask is None:
+                mask = pos.isin(rule.positions).to_numpy()
+                mask_cache[rule.positions] = mask
+            points = np.where(mask, points, 0.0)
+
+        total_points += points
+
+
+def apply_fantasy_scoring(df: pd.DataFrame, rules: Union[Dict[str, Any], ScoringPlan]) -> pd.DataFrame:
     """
     Applies fantasy scoring rules defined in the config.
+    Accepts the raw `scoring` mapping or a pre-compiled ScoringPlan.
     """
+    plan = rules if isinstance(rules, ScoringPlan) else None
+    if plan is None and any(isinstance(v, dict) for v in rules.values()):
+        plan = compile_scoring_rules(rules)
+    flat_rules = plan.flat if plan is not None else rules
+
     # 1. Initialize Points Vector
     total_points = pd.Series(0.0, index=df.index)
 
     # 2. Iterate through every rule in the config
-    for col_name, multiplier in rules.items():
+    for col_name, multiplier in flat_rules.items():
         if multiplier == 0:
             continue
-            
+
         # Check if the column exists in the dataset
         if col_name in df.columns:
             # Add points: Value * Multiplier
@@ -21,7 +155,13 @@ def apply_fantasy_scoring(df: pd.DataFrame, rules: Dict[str, float]) -> pd.DataF
             # Optional: Verbose logging
             pass
 
-    # 3. Assign to DataFrame
+    # 3. Rich rules (position filters, thresholds, tiers)
+    if plan is not None and plan.rules:
+        points = total_points.to_numpy(dtype=float, copy=True)
+        _apply_rich_rules(df, plan.rules, points)
+        total_points = pd.Series(points, index=df.index)
+
+    # 4. Assign to DataFrame
     df = df.copy()
     df['fantasy_points'] = total_points
-    return df
\ No newline at end of file
+    return df
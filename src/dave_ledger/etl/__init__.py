@@ -2,5 +2,6 @@
 
 from .transform import load_and_clean_data
 from .extract import update_data
+from .pbp import update_pbp
 
-__all__ = ["load_and_clean_data", "update_data"]
+__all__ = ["load_and_clean_data", "update_data", "update_pbp"]
@@ -53,10 +53,26 @@ def extract_xfp_data():
         print("❌ No xFP data could be extracted.")
 
 
-def update_data():
+def _write_window(df_new: pd.DataFrame, path, refreshed=None):
+    """
+    Writes one window file atomically. When `refreshed` seasons are given, only those
+    seasons' rows are replaced and every other (closed) season already on disk is kept.
+    """
+    if refreshed is not None and path.exists():
+        old = pd.read_parquet(path)
+        df_new = pd.concat([old[~old['season'].isin(refreshed)], df_new], ignore_index=True)
+    tmp = path.with_suffix('.tmp')
+    df_new.to_parquet(tmp, index=False)
+    tmp.replace(path)
+
+
+def update_data(seasons=None):
     """
     Downloads the latest 5 years of data from nflverse 
     and saves it to data/raw.
+    `seasons` restricts the download (e.g. to the current season in-season);
+    rows for other seasons in the existing files are left untouched. If any window
+    file is missing there is nothing to keep, so the full window is downloaded.
     """
     cfg = config.load_config()
     current_year = cfg['context']['current_year']
@@ -64,7 +80,6 @@ def update_data():
     
     # Calculate years window
     years = [current_year - i for i in range(history_years)]
-    print(f"⬇️  Starting Ingest for window: {years}")
 
     # Setup Paths
     raw_dir = paths.find_repo_root() / "data" / "raw"
@@ -77,21 +92,32 @@ def update_data():
         "rosters": raw_dir / f"rosters_{suffix}"
     }
 
+    if seasons is not None and not all(p.exists() for p in files.values()):
+        print("⚠️ Window files missing; ingesting the full window instead of a partial refresh.")
+        seasons = None
+
+    fetch = sorted(set(seasons) & set(years)) if seasons is not None else years
+    refreshed = fetch if seasons is not None else None
+    if not fetch:
+        print(f"⚠️ Seasons {sorted(seasons)} are outside the window {years}. Nothing to ingest.")
+        return
+    print(f"⬇️  Starting Ingest for window: {fetch}")
+
     # 1. Weekly Stats
     print("   -> Downloading Weekly Stats...")
-    df_weekly = nfl.load_player_stats(seasons=years).to_pandas()
+    df_weekly = nfl.load_player_stats(seasons=fetch).to_pandas()
     df_weekly = df_weekly[df_weekly['season_type'] == 'REG']
-    df_weekly.to_parquet(files["weekly"], index=False)
+    _write_window(df_weekly, files["weekly"], refreshed)
 
     # 2. Snap Counts
     print("   -> Downloading Snap Counts...")
-    df_snaps = nfl.load_snap_counts(seasons=years).to_pandas()
-    df_snaps.to_parquet(files["snaps"], index=False)
+    df_snaps = nfl.load_snap_counts(seasons=fetch).to_pandas()
+    _write_window(df_snaps, files["snaps"], refreshed)
 
     # 3. Rosters
     print("   -> Downloading Rosters...")
-    df_rosters = nfl.load_rosters(seasons=years).to_pandas()
-    df_rosters.to_parquet(files["rosters"], index=False)
+    df_rosters = nfl.load_rosters(seasons=fetch).to_pandas()
+    _write_window(df_rosters, files["rosters"], refreshed)
 
     print(f"✅ Ingest Complete. Data saved to {raw_dir}")
 
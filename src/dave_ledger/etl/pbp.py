@@ -0,0 +1,200 @@
+import shutil
+import urllib.request
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from dave_ledger.core import config, paths
+
+PBP_URL = "https://github.com/nflverse/nflverse-data/releases/download/pbp/play_by_play_{season}.parquet"
+
+# Only these columns are ever read from the (very wide) play-by-play files
+PBP_COLUMNS = [
+    'season', 'week', 'season_type', 'posteam',
+    'rush_attempt', 'pass_attempt', 'sack', 'complete_pass',
+    'yardline_100', 'air_yards', 'rusher_player_id', 'receiver_player_id',
+]
+
+# Additive per-player-week counters; shares are derived after the season is summed
+SUM_FEATURES = ['rz_carries', 'gl_carries', 'rz_targets', 'rz_receptions', 'targets', 'air_yards']
+FEATURES = SUM_FEATURES + ['rz_touches', 'air_yards_share']
+
+# Weekly stats already carry some of these names (targets, air_yards_share),
+# so the features join onto the weekly frame under their own namespace
+JOIN_PREFIX = 'pbp_'
+JOINED_FEATURES = [JOIN_PREFIX + c for c in FEATURES]
+
+KEYS = ['player_id', 'season', 'week', 'posteam']
+
+
+def _aggregate_batch(plays: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Reduces one batch of plays to per-player-week counters and per-team-week air yards."""
+    plays = plays[plays['season_type'] == 'REG']
+    yardline = plays['yardline_100'].fillna(100)
+
+    # Rushing side
+    rush = plays[(plays['rush_attempt'] == 1) & plays['rusher_player_id'].notna()]
+    rush = pd.DataFrame({
+        'player_id': rush['rusher_player_id'],
+        'season': rush['season'],
+        'week': rush['week'],
+        'posteam': rush['posteam'],
+        'rz_carries': (yardline.loc[rush.index] <= 20).astype(float),
+        'gl_carries': (yardline.loc[rush.index] <= 5).astype(float),
+    })
+
+    # Receiving side (targets exclude sacks)
+    tgt = plays[(plays['pass_attempt'] == 1) & (plays['sack'].fillna(0) == 0) & plays['receiver_player_id'].notna()]
+    in_rz = yardline.loc[tgt.index] <= 20
+    tgt = pd.DataFrame({
+        'player_id': tgt['receiver_player_id'],
+        'season': tgt['season'],
+        'week': tgt['week'],
+        'posteam': tgt['posteam'],
+        'targets': 1.0,
+        'rz_targets': in_rz.astype(float),
+        'rz_receptions': (in_rz & (tgt['complete_pass'] == 1)).astype(float),
+        'air_yards': tgt['air_yards'].fillna(0).astype(float),
+    })
+
+    players = pd.concat([rush, tgt], ignore_index=True)
+    players = players.groupby(KEYS, as_index=False)[[c for c in SUM_FEATURES if c in players.columns]].sum()
+    teams = tgt.groupby(['season', 'week', 'posteam'], as_index=False)['air_yards'].sum()
+    return players, teams.rename(columns={'air_yards': 'team_air_yards'})
+
+
+def aggregate_pbp_file(path: Path, batch_size: int = 65_536) -> pd.DataFrame:
+    """
+    Streams one play-by-play parquet file in record batches and returns
+    per-player-week features. Memory is bounded by one batch plus the
+    (small) running per-player-week partials.
+    """
+    pf = pq.ParquetFile(path)
+    missing = [c for c in PBP_COLUMNS if c not in pf.schema_arrow.names]
+    if missing:
+        raise ValueError(f"Play-by-play file {path} is missing columns: {missing}")
+
+    player_parts: List[pd.DataFrame] = []
+    team_parts: List[pd.DataFrame] = []
+    for batch in pf.iter_batches(batch_size=batch_size, columns=PBP_COLUMNS):
+        players, teams = _aggregate_batch(batch.to_pandas())
+        player_parts.append(players)
+        team_parts.append(teams)
+
+    if not player_parts:
+        return pd.DataFrame(columns=['player_id', 'season', 'week'] + FEATURES)
+
+    # Batches can split a game, so partials are re-summed per key
+    players = pd.concat(player_parts, ignore_index=True).groupby(KEYS, as_index=False).sum()
+    teams = pd.concat(team_parts, ignore_index=True).groupby(['season', 'week', 'posteam'], as_index=False).sum()
+    for col in SUM_FEATURES:
+        if col not in players.columns:
+            players[col] = 0.0
+    players[SUM_FEATURES] = players[SUM_FEATURES].fillna(0.0)
+
+    df = players.merge(teams, on=['season', 'week', 'posteam'], how='left')
+    df['rz_touches'] = df['rz_carries'] + df['rz_receptions']
+    team_air = df['team_air_yards'].to_numpy(dtype=float)
+    df['air_yards_share'] = np.divide(
+        df['air_yards'].to_numpy(dtype=float), team_air,
+        out=np.zeros(len(df)), where=np.nan_to_num(team_air) > 0,
+    )
+
+    # One team per player-week, so the team key can be dropped for the join
+    df = df.groupby(['player_id', 'season', 'week'], as_index=False)[FEATURES].sum()
+    df['season'] = df['season'].astype(int)
+    df['week'] = df['week'].astype(int)
+    return df
+
+
+def _is_remote(source: str) -> bool:
+    return source.startswith(('http://', 'https://'))
+
+
+def _fetch(source: str, season: int, dest: Path) -> Path:
+    """Resolves the play-by-play file for a season: a local path is used as-is, URLs are streamed to disk."""
+    location = source.format(season=season)
+    if not _is_remote(location):
+        return Path(location)
+
+    tmp = dest.with_suffix('.part')
+    with urllib.request.urlopen(location) as resp, open(tmp, 'wb') as fh:
+        shutil.copyfileobj(resp, fh, length=1 << 20)
+    tmp.replace(dest)
+    return dest
+
+
+def partition_path(raw_dir: Path, season: int) -> Path:
+    return raw_dir / "pbp" / f"pbp_features_{season}.parquet"
+
+
+def update_pbp(
+    seasons: Optional[Iterable[int]] = None,
+    source: str = PBP_URL,
+    batch_size: int = 65_536,
+    raw_dir: Optional[Path] = None,
+    overwrite: bool = False,
+):
+    """
+    Play-by-play ingestion stage.
+    One season at a time: fetch -> stream in batches -> write a season partition.
+    Closed seasons that already have a partition are skipped unless overwrite=True;
+    the current season is always refreshed.
+    """
+    cfg = config.load_config()
+    current_year = cfg['context']['current_year']
+    if seasons is None:
+        seasons = [current_year - i for i in range(cfg['context']['history_years'])]
+
+    raw_dir = raw_dir or paths.find_repo_root() / "data" / "raw"
+    (raw_dir / "pbp").mkdir(parents=True, exist_ok=True)
+
+    for season in sorted(seasons):
+        out_path = partition_path(raw_dir, season)
+        if out_path.exists() and season != current_year and not overwrite:
+            print(f"   -> PBP {season}: partition exists, skipping.")
+            continue
+
+        print(f"   -> PBP {season}: streaming plays...")
+        download = raw_dir / "pbp" / f"play_by_play_{season}.parquet"
+        try:
+            src = _fetch(source, season, download)
+            features = aggregate_pbp_file(src, batch_size=batch_size)
+        except Exception as e:
+            # Same policy as the xFP extract: one bad season should not sink the run
+            print(f"   ⚠️ Failed to ingest PBP for {season}: {e}")
+            continue
+        finally:
+            # The raw download is ~10x the aggregate; keep only the partition
+            if _is_remote(source) and download.exists():
+                download.unlink()
+
+        tmp = out_path.with_suffix('.tmp')
+        features.to_parquet(tmp, index=False)
+        tmp.replace(out_path)
+        print(f"   -> ✅ Saved {len(features):,} player-weeks to {out_path.name}")
+
+
+def load_pbp_features(raw_dir: Path, seasons: Iterable[int]) -> pd.DataFrame:
+    """Reads whichever season partitions exist; empty frame if none do."""
+    parts = [pd.read_parquet(p) for p in (partition_path(raw_dir, s) for s in seasons) if p.exists()]
+    if not parts:
+        return pd.DataFrame()
+    return pd.concat(parts, ignore_index=True)
+
+
+def join_pbp_features(weekly: pd.DataFrame, features: pd.DataFrame) -> pd.DataFrame:
+    """Left-joins features onto weekly rows as pbp_* columns; player-weeks with no plays get 0."""
+    features = features.rename(columns={c: JOIN_PREFIX + c for c in FEATURES})
+    cols = ['player_id', 'season', 'week'] + [c for c in JOINED_FEATURES if c in features.columns]
+    df = pd.merge(weekly, features[cols], on=['player_id', 'season', 'week'], how='left')
+    joined = [c for c in JOINED_FEATURES if c in df.columns]
+    df[joined] = df[joined].fillna(0.0)
+    return df
+
+
+if __name__ == "__main__":
+    update_pbp()
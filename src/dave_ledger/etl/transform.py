@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 
 from dave_ledger.core import config, paths
+from dave_ledger.etl import pbp
 
 logger = logging.getLogger(__name__)
 
@@ -89,6 +90,12 @@ def load_and_clean_data() -> pd.DataFrame:
                   on=['player_id', 'season', 'week'], 
                   how='left')
 
+    # Merge Play-by-Play Features (Left Merge, only if the pbp stage has run)
+    pbp_features = pbp.load_pbp_features(raw_dir, years)
+    if not pbp_features.empty:
+        df = pbp.join_pbp_features(df, pbp_features)
+        logger.info(f"🔧 Joined play-by-play features for {pbp_features['season'].nunique()} season(s)")
+
     # --- 5. Merge Roster (Left Merge) ---
     # Get latest metadata per player (tail(1) gets the most recent entry)
     latest_roster = rosters.sort_values('season').groupby('player_id').tail(1)
@@ -1,18 +1,19 @@
 import logging
 
-from dave_ledger.analysis import baselines, valuation
-from dave_ledger.core import scoring
+from dave_ledger.analysis import baselines, ledger, valuation
+from dave_ledger.core import paths, scoring
 from dave_ledger.core.config import load_config
-from dave_ledger.etl import extract, transform
+from dave_ledger.etl import extract, pbp, transform
 
 # Configure simple logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def run_dave(update: bool = False):
+def run_dave(update: bool = False, play_by_play: bool = False):
     """
     Main entry point for the DAVE Ledger.
     Runs Ingestion -> Transform -> Scoring -> Baselines -> Valuation.
+    `play_by_play=True` also runs the (much larger) play-by-play ingestion when updating.
     """
     # 1. Load Configuration
     try:
@@ -27,6 +28,9 @@ def run_dave(update: bool = False):
         logger.info("🔄 Update requested. Running ingestion...")
         try:
             extract.update_data()
+            if play_by_play:
+                logger.info("🔄 Streaming play-by-play...")
+                pbp.update_pbp()
         except Exception as e:
             logger.error(f"❌ Ingestion failed: {e}")
             raise
@@ -40,6 +44,18 @@ def run_dave(update: bool = False):
         logger.error("❌ Data not found! Hint: Run 'run_dave(update=True)' first.")
         raise
 
+    ledger_path = paths.find_repo_root() / "data" / "board" / "ledger.parquet"
+    df_final = score_and_value(df_raw, cfg, ledger_path=ledger_path)
+    
+    logger.info("✅ Pipeline Complete.")
+    return df_final
+
+def score_and_value(df_raw, cfg, ledger_path=None):
+    """
+    The config-driven half of the pipeline: Scoring -> Baselines -> Valuation.
+    Split out so a config-only change can revalue without re-ingesting or re-transforming.
+    If the valuator emitted a cashflow ledger and `ledger_path` is set, it is written there.
+    """
     # 4. Apply Scoring
     logger.info("2. [SCORING] Applying League Rules...")
     df_scored = scoring.apply_fantasy_scoring(df_raw, cfg['scoring'])
@@ -53,8 +69,10 @@ def run_dave(update: bool = False):
     # Initialize Valuator with data, full config, and the baselines we just calculated
     valuator = valuation.AssetValuator(df_scored, cfg, baselines=pos_baselines)
     df_final = valuator.run_valuation()
-    
-    logger.info("✅ Pipeline Complete.")
+
+    if valuator.ledger is not None and ledger_path is not None:
+        ledger.write_ledger(valuator.ledger, ledger_path)
+
     return df_final
 
 if __name__ == "__main__":
@@ -0,0 +1,244 @@
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+import pandas as pd
+
+from dave_ledger import pipeline
+from dave_ledger.core import paths
+from dave_ledger.core.config import load_config
+from dave_ledger.etl import extract, pbp, transform
+
+logger = logging.getLogger(__name__)
+
+# Files that are mid-write (ours or a downloader's) are never treated as changes
+IGNORED_SUFFIXES = {'.tmp', '.part', '.swp'}
+
+Snapshot = Dict[Path, Tuple[int, int]]
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec='seconds') if ts else None
+
+
+def _atomic_write_bytes(path: Path, data: bytes):
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+def publish_board(df: pd.DataFrame, board_dir: Path) -> Path:
+    """Writes the board next to the live one, then swaps it in with a single rename."""
+    board_dir.mkdir(parents=True, exist_ok=True)
+    path = board_dir / "board.parquet"
+    tmp = board_dir / "board.parquet.tmp"
+    df.to_parquet(tmp, index=False)
+    tmp.replace(path)
+    return path
+
+
+def read_status(board_dir: Optional[Path] = None) -> Dict[str, Any]:
+    board_dir = board_dir or paths.find_repo_root() / "data" / "board"
+    path = board_dir / "status.json"
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+class Watcher:
+    """
+    Keeps the board fresh in-season.
+
+    Every `interval` seconds it stats config/*.yaml and data/raw (cheap; no work when idle).
+    Changes are debounced for `debounce` seconds, then only the affected stages run:
+      - config change -> scoring/baselines/valuation on the cached transformed history
+                         (plus transform if the `context` window changed)
+      - data/raw change -> transform + valuation
+      - scheduled poll  -> ingest the current season only, then transform + valuation
+    The board and a status.json are published atomically to data/board.
+    """
+
+    def __init__(
+        self,
+        interval: float = 2.0,
+        debounce: float = 5.0,
+        poll_every: float = 6 * 3600.0,
+        play_by_play: bool = False,
+        config_dir: Optional[Path] = None,
+        raw_dir: Optional[Path] = None,
+        board_dir: Optional[Path] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+        stages: Optional[Dict[str, Callable]] = None,
+    ):
+        root = None if (config_dir and raw_dir and board_dir) else paths.find_repo_root()
+        self.config_dir = config_dir or paths.config_dir()
+        self.raw_dir = raw_dir or root / "data" / "raw"
+        self.board_dir = board_dir or root / "data" / "board"
+        self.interval = interval
+        self.debounce = debounce
+        self.poll_every = poll_every
+        self.play_by_play = play_by_play
+        self.clock = clock
+        self.sleep = sleep
+
+        # Stage hooks; tests swap these for fakes
+        self.stages = {
+            'load_config': load_config,
+            'ingest': self._ingest,
+            'transform': transform.load_and_clean_data,
+            'value': lambda df, cfg: pipeline.score_and_value(df, cfg, ledger_path=self.board_dir / "ledger.parquet"),
+        }
+        self.stages.update(stages or {})
+
+        self._snapshot = self.scan()
+        self._pending: Set[str] = set()
+        self._last_change: Optional[float] = None
+        self._next_poll = self.clock() + self.poll_every
+        self._cfg: Optional[Dict[str, Any]] = None
+        self._df_raw: Optional[pd.DataFrame] = None
+        self.last_run: Dict[str, Any] = {}
+
+    # --- Change detection ---
+    def scan(self) -> Snapshot:
+        files = list(self.config_dir.glob("*.yaml"))
+        if self.raw_dir.exists():
+            files += [p for p in self.raw_dir.rglob("*") if p.is_file()]
+        snap = {}
+        for p in files:
+            if p.suffix in IGNORED_SUFFIXES:
+                continue
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue  # Deleted between listing and stat
+            snap[p] = (st.st_mtime_ns, st.st_size)
+        return snap
+
+    def _classify(self, changed: Set[Path]) -> Set[str]:
+        kinds = set()
+        for p in changed:
+            kinds.add('config' if p.parent == self.config_dir else 'data')
+        return kinds
+
+    @staticmethod
+    def _diff(old: Snapshot, new: Snapshot) -> Set[Path]:
+        return {p for p in set(old) | set(new) if old.get(p) != new.get(p)}
+
+    # --- Stages ---
+    def _ingest(self, cfg: Dict[str, Any]):
+        """In-season refresh: closed seasons never change, so only the current one is pulled."""
+        current_year = cfg['context']['current_year']
+        extract.update_data(seasons=[current_year])
+        if self.play_by_play:
+            pbp.update_pbp(seasons=[current_year], raw_dir=self.raw_dir)
+
+    def run(self, trigger: str, kinds: Set[str]):
+        started = self.clock()
+        ran = []
+        # Everything up to here has been accounted for; anything else that changes
+        # during the run is requeued below, except what our own ingest wrote
+        baseline = self._snapshot
+        ingested: Snapshot = {}
+        try:
+            cfg = self.stages['load_config']()
+            needs_transform = (
+                self._df_raw is None
+                or bool(kinds & {'data', 'ingest'})
+                or (self._cfg or {}).get('context') != cfg.get('context')
+            )
+
+            if 'ingest' in kinds:
+                before = self.scan()
+                try:
+                    self.stages['ingest'](cfg)
+                finally:
+                    after = self.scan()
+                    ingested = {
+                        p: after.get(p) for p in self._diff(before, after)
+                        if self.raw_dir in p.parents
+                    }
+                ran.append('ingest')
+            if needs_transform:
+                self._df_raw = self.stages['transform']()
+                ran.append('transform')
+            board = self.stages['value'](self._df_raw, cfg)
+            ran.append('value')
+
+            publish_board(board, self.board_dir)
+            self._cfg = cfg
+            self.last_run = {'ok': True, 'rows': int(len(board))}
+            logger.info(f"✅ Board published ({trigger}: {' -> '.join(ran)}, {len(board)} rows)")
+        except Exception as e:
+            # Keep serving the previous board; a half-saved YAML should not kill the watcher
+            self.last_run = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+            logger.error(f"❌ Watch run failed ({trigger}): {e}")
+            if kinds & {'data', 'ingest'}:
+                # The cached history may predate the failed change; force a fresh transform next run
+                self._df_raw = None
+        finally:
+            finished = self.clock()
+            self.last_run.update({
+                'trigger': trigger,
+                'stages': ran,
+                'started': _iso(started),
+                'duration_s': round(finished - started, 3),
+            })
+            # Our own ingest writes into data/raw; absorb those so they don't retrigger.
+            # Edits by anyone else during the run go back into the queue.
+            snap = self.scan()
+            external = {p for p in self._diff(baseline, snap) if p not in ingested or ingested[p] != snap.get(p)}
+            self._snapshot = snap
+            if external:
+                self._pending |= self._classify(external)
+                self._last_change = finished
+            self.write_status()
+
+    def write_status(self):
+        self.board_dir.mkdir(parents=True, exist_ok=True)
+        status = {
+            'last_run': self.last_run,
+            'next_poll': _iso(self._next_poll),
+            'pending': sorted(self._pending),
+            'watching': [str(self.config_dir), str(self.raw_dir)],
+        }
+        _atomic_write_bytes(self.board_dir / "status.json", json.dumps(status, indent=2).encode())
+
+    # --- Loop ---
+    def step(self) -> Optional[str]:
+        """One poll iteration. Returns the trigger that ran, if any."""
+        now = self.clock()
+
+        snap = self.scan()
+        changed = self._diff(self._snapshot, snap)
+        self._snapshot = snap
+        if changed:
+            self._pending |= self._classify(changed)
+            self._last_change = now
+
+        if now >= self._next_poll:
+            self._next_poll = now + self.poll_every
+            kinds = self._pending | {'ingest'}
+            self._pending = set()
+            self.run('poll', kinds)
+            return 'poll'
+
+        if self._pending and now - self._last_change >= self.debounce:
+            kinds, self._pending = self._pending, set()
+            trigger = 'config' if kinds == {'config'} else 'data'
+            self.run(trigger, kinds)
+            return trigger
+
+        return None
+
+    def run_forever(self, initial: bool = True):
+        logger.info(f"👀 Watching {self.config_dir} and {self.raw_dir} (poll every {self.poll_every:.0f}s)")
+        if initial:
+            self.run('startup', {'data'})
+        try:
+            while True:
+                self.step()
+                self.sleep(self.interval)
+        except KeyboardInterrupt:
+            logger.info("👋 Watch stopped.")
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+HISTORY_COLUMNS = ["player_id", "fantasy_group", "season", "week", "birth_year", "fantasy_points"]
+
+
+def build_history(players, weeks=17, current_year=2025):
+    """
+    Weekly history frame from (player_id, fantasy_group, birth_year, {season: points}) specs.
+    `points` is either one score for every week or a sequence of `weeks` scores.
+    """
+    rows = []
+    for pid, group, birth_year, seasons in players:
+        for season, points in seasons.items():
+            weekly = np.broadcast_to(np.asarray(points, dtype=float), (weeks,))
+            rows.extend((pid, group, season, week, birth_year, pts) for week, pts in enumerate(weekly, start=1))
+    df = pd.DataFrame(rows, columns=HISTORY_COLUMNS)
+    df["position"] = df["fantasy_group"]
+    df["current_age"] = current_year + 1 - df["birth_year"]
+    return df
+
+
+@pytest.fixture
+def make_history():
+    return build_history
@@ -0,0 +1,84 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dave_ledger.analysis.backtest import run_backtest, score_backtest
+from dave_ledger.analysis.baselines import calculate_replacement_level
+from dave_ledger.analysis.valuation import AssetValuator
+
+
+@pytest.fixture
+def history(make_history):
+    # A wide talent spread (so rank correlations are meaningful), noisy weeks, ~15% missed games
+    rng = np.random.default_rng(0)
+    players = []
+    for p, base in enumerate(np.linspace(4.0, 24.0, 16)):
+        played = rng.random((3, 17)) < 0.85
+        played[0, 0] = True  # everyone has a game in the first snapshot
+        weeks = rng.normal(base, 3, (3, 17)).clip(0) * played
+        players.append((f"P{p}", ["QB", "RB", "WR", "TE"][p % 4], 1990 + p % 12, dict(zip((2023, 2024, 2025), weeks))))
+    return make_history(players)
+
+
+CFG = {"context": {"current_year": 2025}, "valuation": {}}
+FLOORS = {"QB": 12.0, "RB": 8.0, "WR": 8.0, "TE": 6.0}
+
+
+def test_final_snapshot_matches_full_valuation(history):
+    df = history
+    snaps = run_backtest(df, CFG, fixed_baselines=FLOORS)
+    last = snaps[snaps["step"] == snaps["step"].max()].set_index("player_id")
+
+    full = AssetValuator(df, CFG, baselines=FLOORS).run_valuation().set_index("player_id")
+    for col in ["talent_ppg", "availability_score", "risk_cv", "dcf_value", "vorp"]:
+        np.testing.assert_allclose(last[col], full.loc[last.index, col], rtol=1e-9, atol=1e-9)
+
+
+def test_snapshots_have_no_look_ahead(history):
+    df = history
+    base = run_backtest(df, CFG, fixed_baselines=FLOORS)
+
+    # Rewrite the final season: nothing as-of 2024 may change except the realized outcomes
+    future = df.copy()
+    future.loc[future["season"] == 2025, "fantasy_points"] *= 3
+    shifted = run_backtest(future, CFG, fixed_baselines=FLOORS)
+
+    cols = ["talent_ppg", "availability_score", "risk_cv", "dcf_value"]
+    mask = base["season"] < 2025
+    pd.testing.assert_frame_equal(base.loc[mask, cols], shifted.loc[mask, cols])
+    assert not np.allclose(base.loc[mask, "realized_ppg"].dropna(), shifted.loc[mask, "realized_ppg"].dropna())
+
+
+def test_realized_window_and_scoring(history):
+    df = history
+    snaps = run_backtest(df, CFG, horizon_weeks=17, fixed_baselines=FLOORS)
+
+    # The last 17 weeks have no complete forward window
+    assert snaps.loc[snaps["step"] >= snaps["step"].max() - 16, "realized_ppg"].isna().all()
+
+    metrics = score_backtest(snaps)
+    assert {"n", "spearman_talent_ppg", "spearman_dcf_value", "mae", "rmse", "bias"} <= set(metrics.columns)
+    assert metrics["spearman_talent_ppg"].between(-1, 1).all()
+    assert (metrics["spearman_talent_ppg"] > 0.5).all()
+
+
+def test_point_in_time_baselines_match_direct_solve(history, caplog):
+    # Lineups are solved once up front; each step's replacement line must equal
+    # a from-scratch baseline on that season-to-date slice
+    df = history.assign(full_name=history["player_id"])
+    cfg = {**CFG, "league": {"num_teams": 2, "starters": {"QB": 1, "RB": 1, "WR": 1, "TE": 1, "FLEX": 1}}}
+    annuity = sum(17 / 1.15 ** i for i in range(1, 4))
+
+    with caplog.at_level(logging.INFO, logger="dave_ledger.analysis.baselines"):
+        snaps = run_backtest(df, cfg, start_season=2025)
+    assert not [r for r in caplog.records if r.name == "dave_ledger.analysis.baselines" and r.levelno == logging.INFO]
+    assert logging.getLogger("dave_ledger.analysis.baselines").level == logging.NOTSET
+
+    for week in (1, 9, 17):
+        snap = snaps[snaps["week"] == week]
+        to_date = df[(df["season"] == 2025) & (df["week"] <= week)]
+        direct = calculate_replacement_level(to_date, cfg, verbose=False)
+        floors = snap["fantasy_group"].map(direct).fillna(0.0)
+        np.testing.assert_allclose(snap["dcf_value"] - snap["vorp"], floors * annuity)
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+import yaml
+
+from dave_ledger.analysis import calibration
+from dave_ledger.core.config import load_config
+
+
+def test_performance_curve_recovers_step_function():
+    rng = np.random.default_rng(0)
+    ages = rng.integers(21, 36, 3000)
+    truth = np.where(ages <= 24, 1.10, np.where(ages >= 29, 0.85, 1.0))
+    ratios = truth + rng.normal(0, 0.05, len(ages))
+
+    fit = calibration.fit_performance_curve(ages, ratios, np.ones(len(ages)))
+    assert fit["end_age"] == 24
+    assert fit["start_age"] == 29
+    assert abs(fit["growth_rate"] - 0.10) <= 0.01
+    assert abs(fit["decay_rate"] - 0.15) <= 0.01
+
+
+def test_retirement_curve_recovers_logistic():
+    rng = np.random.default_rng(1)
+    ages = rng.integers(22, 40, 20000).astype(float)
+    p_exit = 1 / (1 + np.exp(-0.7 * (ages - 33.0)))
+    exited = rng.random(len(ages)) < p_exit
+
+    fit = calibration.fit_retirement_curve(ages, exited)
+    assert abs(fit["cliff_age"] - 33.0) <= 0.5
+    assert abs(fit["k"] - 0.7) <= 0.1
+
+
+@pytest.fixture
+def history(make_history):
+    # One WR per birth year who improves 10% a year through age 25, then holds steady
+    players = []
+    for birth_year in range(1992, 2001):
+        ppg, seasons = 10.0, {}
+        for season in range(2021, 2026):
+            ppg *= 1.1 if season + 1 - birth_year <= 25 else 1.0
+            seasons[season] = ppg
+        players.append((f"WR{birth_year}", "WR", birth_year, seasons))
+    return make_history(players)
+
+
+def test_overlay_round_trips_through_load_config(history, tmp_path, monkeypatch):
+    cfg = {"context": {"current_year": 2025}}
+    overlay = calibration.fit_aging_curves(history, cfg)
+    assert overlay["valuation"]["performance_growth"]["WR"] == {"end_age": 25, "growth_rate": 0.1}
+
+    cfg_dir = tmp_path / "config"
+    cfg_dir.mkdir()
+    (cfg_dir / "default.yaml").write_text(yaml.safe_dump({"valuation": {"discount_rate": 0.15}}))
+    (cfg_dir / "local.yaml").write_text(yaml.safe_dump({"league": {"num_teams": 10}}))
+    monkeypatch.setenv("DAVE_LEDGER_CONFIG_DIR", str(cfg_dir))
+
+    calibration.write_overlay(overlay)
+    loaded = load_config()
+    assert loaded["league"]["num_teams"] == 10
+    assert loaded["valuation"]["discount_rate"] == 0.15
+    assert loaded["valuation"]["performance_growth"]["WR"]["end_age"] == 25
+
+
+def test_unidentified_parameters_are_left_out(history, caplog):
+    # Nobody exits and nobody decays: the retirement fit would sit on the grid edge
+    # and decay_rate would be pinned at 0, so neither may overwrite the configured values
+    overlay = calibration.fit_aging_curves(history, {"context": {"current_year": 2025}})
+    val = overlay["valuation"]
+    assert "retirement_risk" not in val
+    assert "performance_decay" not in val
+    assert val["performance_growth"]["WR"] == {"end_age": 25, "growth_rate": 0.1}
+    assert "exits" in caplog.text
+
+
+def test_curves_are_emitted_as_complete_pairs(make_history, caplog):
+    # WRs grow 20% a year only through age 20: end_age sits on the grid edge,
+    # so growth_rate must not be emitted on its own (it would apply through the configured end_age)
+    players = []
+    for birth_year in range(1998, 2007):
+        ppg, seasons = 10.0, {}
+        for season in range(2021, 2026):
+            ppg *= 1.2 if season + 1 - birth_year <= 20 else 1.0
+            seasons[season] = ppg
+        players.append((f"WR{birth_year}", "WR", birth_year, seasons))
+
+    overlay = calibration.fit_aging_curves(make_history(players), {"context": {"current_year": 2025}})
+    assert "WR" not in overlay.get("valuation", {}).get("performance_growth", {})
+    assert "end_age = 20" in caplog.text
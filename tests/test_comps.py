@@ -0,0 +1,74 @@
+import numpy as np
+
+from dave_ledger.analysis.comps import CompsEngine, TrajectoryIndex
+from dave_ledger.analysis.valuation import AssetValuator
+
+
+def test_index_matches_brute_force():
+    rng = np.random.default_rng(0)
+    X = rng.random((400, 5))
+    groups = rng.choice(["RB", "WR"], 400)
+    Q = rng.random((50, 5))
+    q_groups = rng.choice(["RB", "WR"], 50)
+
+    idx, dist = TrajectoryIndex(X, groups, np.arange(400), block_size=16).query(Q, q_groups, -np.arange(1, 51), k=4)
+
+    for i in range(len(Q)):
+        cand = np.flatnonzero(groups == q_groups[i])
+        d = np.linalg.norm(X[cand] - Q[i], axis=1)
+        np.testing.assert_array_equal(idx[i], cand[np.argsort(d)[:4]])
+        np.testing.assert_allclose(dist[i], np.sort(d)[:4])
+
+
+def test_index_excludes_owner():
+    X = np.array([[0.0], [1.0], [5.0]])
+    idx, _ = TrajectoryIndex(X, ["WR"] * 3, ["A", "B", "C"]).query(np.array([[0.0]]), ["WR"], ["A"], k=3)
+    assert idx.tolist() == [[1, 2, -1]]
+
+
+# WRs who debut at 23 (2023) and double their PPG the next season, and an active 23-year-old rookie
+PLAYERS = [(f"H{p}", "WR", 2001, {2023: 5.5, 2024: 11.0, 2025: 11.0}) for p in range(8)] + [
+    ("NEW", "WR", 2003, {2025: 5.0})
+]
+# Someone plays every loaded season, as in real history
+PLAYERS.append(("OLD", "RB", 1990, {season: 12.0 for season in range(2021, 2026)}))
+
+
+def test_comp_multipliers_drive_projection(make_history):
+    df = make_history(PLAYERS)
+    cfg = {"context": {"current_year": 2025}, "valuation": {"comps": {"enabled": True, "k": 5, "min_comps": 3}}}
+
+    mult = CompsEngine(df, cfg).multipliers()
+    assert mult.loc["NEW", "year_1"] == 2.0
+    assert np.isnan(mult.loc["NEW", "year_3"])
+
+    comps = CompsEngine(df, cfg).query()
+    assert set(comps.loc[comps["player_id"] == "NEW", "comp_player_id"]) <= {f"H{p}" for p in range(8)}
+
+    with_comps = AssetValuator(df, cfg).run_valuation().set_index("player_id")
+    cfg["valuation"]["comps"]["enabled"] = False
+    curve = AssetValuator(df, cfg).run_valuation().set_index("player_id")
+    assert with_comps.loc["NEW", "dcf_value"] > curve.loc["NEW", "dcf_value"]
+
+
+def test_truncated_veteran_window_is_not_a_rookie_comp(make_history):
+    # VET's 2021 season is the first one loaded, not his debut: closer to NEW's age and PPG
+    # than the real rookies, but his (unknown) earlier seasons must not read as pre-debut zeros
+    vets = [(f"VET{p}", "WR", 1999, {2021: 5.0, 2022: 1.0}) for p in range(8)]
+    df = make_history(PLAYERS + vets)
+    cfg = {"context": {"current_year": 2025}, "valuation": {"comps": {"enabled": True, "k": 5, "min_comps": 3}}}
+
+    comps = CompsEngine(df, cfg).query()
+    assert set(comps.loc[comps["player_id"] == "NEW", "comp_player_id"]) <= {f"H{p}" for p in range(8)}
+    assert CompsEngine(df, cfg).multipliers().loc["NEW", "year_1"] == 2.0
+
+
+def test_missed_season_is_not_pre_debut(make_history):
+    # GAP played at 20, sat out two seasons and returned at 23: [0, 0, 5] like NEW, but not a debut
+    gaps = [(f"GAP{p}", "WR", 2002, {2021: 5.0, 2024: 5.0, 2025: 1.0}) for p in range(8)]
+    df = make_history(PLAYERS + gaps)
+    cfg = {"context": {"current_year": 2025}, "valuation": {"comps": {"enabled": True, "k": 8, "min_comps": 3}}}
+
+    comps = CompsEngine(df, cfg).query()
+    nearest = comps[comps["player_id"] == "NEW"].sort_values("rank")["comp_player_id"]
+    assert set(nearest.head(8)) == {f"H{p}" for p in range(8)}
@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from dave_ledger.etl import extract
+
+
+class FakeFrame:
+    def __init__(self, df):
+        self.df = df
+
+    def to_pandas(self):
+        return self.df
+
+
+@pytest.fixture
+def raw_env(tmp_path, monkeypatch):
+    monkeypatch.setattr(extract.config, "load_config", lambda: {"context": {"current_year": 2025, "history_years": 3}})
+    monkeypatch.setattr(extract.paths, "find_repo_root", lambda: tmp_path)
+
+    fetched = []
+
+    def loader(seasons):
+        fetched.append(list(seasons))
+        return FakeFrame(pd.DataFrame({"season": seasons, "season_type": "REG", "v": "new"}))
+
+    for name in ("load_player_stats", "load_snap_counts", "load_rosters"):
+        monkeypatch.setattr(extract.nfl, name, loader)
+    return tmp_path / "data" / "raw", fetched
+
+
+def test_partial_refresh_without_window_files_downloads_full_window(raw_env):
+    raw_dir, fetched = raw_env
+    extract.update_data(seasons=[2025])
+
+    assert fetched == [[2025, 2024, 2023]] * 3
+    assert sorted(pd.read_parquet(raw_dir / "weekly_2023_2025.parquet")["season"]) == [2023, 2024, 2025]
+
+
+def test_partial_refresh_keeps_closed_seasons(raw_env):
+    raw_dir, fetched = raw_env
+    extract.update_data()
+    fetched.clear()
+
+    extract.update_data(seasons=[2025])
+    assert fetched == [[2025]] * 3
+    assert sorted(pd.read_parquet(raw_dir / "weekly_2023_2025.parquet")["season"]) == [2023, 2024, 2025]
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from dave_ledger.analysis.ledger import read_ledger, write_ledger
+from dave_ledger.analysis.valuation import AssetValuator
+
+
+PLAYERS = [
+    ("YOUNG", "WR", 2005, 4.0),   # below the floor but shielded
+    ("STAR", "WR", 1998, 18.0),
+    ("BACKUP", "RB", 1997, 5.0),  # below the floor -> handcuff
+    ("VET", "TE", 1992, 7.0),     # below the floor, not young -> cut in year 1
+]
+
+
+@pytest.fixture
+def history(make_history):
+    return make_history([(pid, group, by, {2024: ppg, 2025: ppg}) for pid, group, by, ppg in PLAYERS])
+
+
+CFG = {"context": {"current_year": 2025}, "valuation": {"emit_ledger": True}}
+FLOORS = {"WR": 8.0, "RB": 8.0, "TE": 8.0}
+
+
+def test_ledger_reconciles_to_dcf(history):
+    valuator = AssetValuator(history, CFG, baselines=FLOORS)
+    board = valuator.run_valuation().set_index("player_id")
+
+    ledger = valuator.ledger.to_pandas()
+    totals = ledger.groupby("player_id")["pv"].sum()
+    np.testing.assert_allclose(totals.reindex(board.index).fillna(0.0), board["dcf_value"])
+
+    decisions = {pid: set(g.astype(str)) for pid, g in ledger.groupby("player_id")["decision"]}
+    assert "shield" in decisions["YOUNG"]
+    assert decisions["STAR"] == {"score"}
+    assert "handcuff" in decisions["BACKUP"]
+    assert decisions["VET"] == {"cut"}
+    assert ledger.loc[ledger["player_id"] == "VET", "pv"].tolist() == [0.0]
+
+    star = ledger[ledger["player_id"] == "STAR"]
+    assert star["year"].tolist() == list(range(1, len(star) + 1))
+    assert (np.diff(star["survival"]) <= 0).all()
+
+
+def test_ledger_filtered_read(history, tmp_path):
+    valuator = AssetValuator(history, CFG, baselines=FLOORS)
+    valuator.run_valuation()
+    path = write_ledger(valuator.ledger, tmp_path / "ledger.parquet")
+
+    star = read_ledger(path, ["STAR"])
+    assert set(star["player_id"]) == {"STAR"}
+    assert len(read_ledger(path)) == valuator.ledger.num_rows
+
+
+def test_ledger_off_by_default(history):
+    valuator = AssetValuator(history, {"context": {"current_year": 2025}}, baselines=FLOORS)
+    valuator.run_valuation()
+    assert valuator.ledger is None
@@ -0,0 +1,93 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dave_ledger.analysis.baselines import calculate_replacement_level
+from dave_ledger.analysis.lineups import FLEX_ELIGIBILITY, flex_composition, solve_lineups
+
+SLOTS = {"QB": 1, "RB": 1, "WR": 1, "FLEX": 1, "SUPERFLEX": 1}
+
+
+def _brute_force(week: pd.DataFrame) -> float:
+    slots = [s for s, n in SLOTS.items() for _ in range(n)]
+    rows = list(week.itertuples(index=False))
+    best = 0.0
+    for combo in itertools.permutations(range(len(rows)), len(slots)):
+        ok = all(
+            rows[i].fantasy_group == slot or rows[i].fantasy_group in FLEX_ELIGIBILITY.get(slot, [])
+            for i, slot in zip(combo, slots)
+        )
+        if ok:
+            best = max(best, sum(rows[i].fantasy_points for i in combo))
+    return best
+
+
+def test_greedy_matches_brute_force():
+    rng = np.random.default_rng(0)
+    cfg = {"league": {"num_teams": 1, "starters": SLOTS}}
+    frames = []
+    for week in range(1, 31):
+        groups = rng.choice(["QB", "RB", "WR", "TE"], 8)
+        frames.append(pd.DataFrame({
+            "season": 2025,
+            "week": week,
+            "player_id": [f"W{week}P{i}" for i in range(8)],
+            "fantasy_group": groups,
+            "fantasy_points": rng.gamma(2.0, 6.0, 8).round(1),
+        }))
+    df = pd.concat(frames, ignore_index=True)
+
+    starters = solve_lineups(df, cfg)
+    solved = starters.groupby("week")["fantasy_points"].sum()
+    for week, sub in df.groupby("week"):
+        if (sub["fantasy_group"] == "QB").any() and (sub["fantasy_group"] == "RB").any() and (sub["fantasy_group"] == "WR").any():
+            assert solved[week] == pytest.approx(_brute_force(sub))
+
+
+def _league_week(te_points: float):
+    # 2-team league; TEs outscore the spare RB/WRs when te_points is high
+    rows = [
+        ("QB1", "QB", 25), ("QB2", "QB", 22), ("QB3", "QB", 20), ("QB4", "QB", 19),
+        ("RB1", "RB", 18), ("RB2", "RB", 15), ("RB3", "RB", 8),
+        ("WR1", "WR", 17), ("WR2", "WR", 14), ("WR3", "WR", 7),
+        ("TE1", "TE", te_points), ("TE2", "TE", te_points - 1),
+        ("TE3", "TE", te_points - 2), ("TE4", "TE", te_points - 3),
+    ]
+    return pd.DataFrame(
+        [(2025, w, pid, grp, pts, pid) for w in range(1, 4) for pid, grp, pts in rows],
+        columns=["season", "week", "player_id", "fantasy_group", "fantasy_points", "full_name"],
+    )
+
+
+CFG = {"league": {"num_teams": 2, "starters": {"QB": 1, "RB": 1, "WR": 1, "TE": 1, "FLEX": 1, "SUPERFLEX": 1}}}
+
+
+def test_flex_composition_follows_scoring():
+    starters = solve_lineups(_league_week(te_points=12), CFG)
+    mix = flex_composition(starters)
+    assert mix["FLEX"] == {"TE": 1.0}
+    assert mix["SUPERFLEX"] == {"QB": 1.0}
+    assert len(starters) == 3 * 2 * 6
+
+    mix = flex_composition(solve_lineups(_league_week(te_points=3), CFG))
+    assert mix["FLEX"] == {"RB": 0.5, "WR": 0.5}
+
+
+def test_baselines_use_realized_flex_mix():
+    # TEs take every FLEX start, so RB demand is the dedicated slot only: RB2 is the line
+    assert calculate_replacement_level(_league_week(te_points=12), CFG)["RB"] == 15
+    # RBs take half the FLEX starts: 3 RBs wanted, only 3 exist -> no line
+    assert calculate_replacement_level(_league_week(te_points=3), CFG)["RB"] == 0.0
+
+
+def test_custom_flex_slot_is_not_a_position():
+    cfg = {"league": {
+        "num_teams": 2,
+        "starters": {"QB": 1, "RB": 1, "WR": 1, "TE": 1, "WRTE": 1},
+        "flex_eligibility": {"WRTE": ["WR", "TE"]},
+    }}
+    baselines = calculate_replacement_level(_league_week(te_points=12), cfg)
+    assert "WRTE" not in baselines
+    assert set(baselines) == {"QB", "RB", "WR", "TE"}
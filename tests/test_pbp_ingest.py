@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dave_ledger.etl import pbp
+
+
+def _plays():
+    # Two teams, one week; rusher R1, receivers W1/W2 (KC), W3 (BUF)
+    rows = [
+        # season, week, type, team, rush, pass, sack, complete, yardline, air, rusher, receiver
+        (2024, 1, "REG", "KC", 1, 0, 0, 0, 3, np.nan, "R1", None),
+        (2024, 1, "REG", "KC", 1, 0, 0, 0, 15, np.nan, "R1", None),
+        (2024, 1, "REG", "KC", 1, 0, 0, 0, 60, np.nan, "R1", None),
+        (2024, 1, "REG", "KC", 0, 1, 0, 1, 18, 10.0, None, "W1"),
+        (2024, 1, "REG", "KC", 0, 1, 0, 0, 40, 30.0, None, "W2"),
+        (2024, 1, "REG", "KC", 0, 1, 1, 0, 30, np.nan, None, None),
+        (2024, 1, "REG", "KC", 0, 1, 0, 1, 70, 0.0, None, "R1"),
+        (2024, 1, "REG", "BUF", 0, 1, 0, 1, 8, 5.0, None, "W3"),
+        (2024, 1, "POST", "KC", 1, 0, 0, 0, 1, np.nan, "R1", None),
+    ]
+    cols = ["season", "week", "season_type", "posteam", "rush_attempt", "pass_attempt", "sack",
+            "complete_pass", "yardline_100", "air_yards", "rusher_player_id", "receiver_player_id"]
+    df = pd.DataFrame(rows, columns=cols)
+    df["desc"] = "unused wide column"
+    return df
+
+
+@pytest.fixture
+def pbp_file(tmp_path):
+    path = tmp_path / "pbp_2024.parquet"
+    _plays().to_parquet(path, index=False, row_group_size=2)
+    return path
+
+
+def test_batched_aggregation_matches_single_batch(pbp_file):
+    small = pbp.aggregate_pbp_file(pbp_file, batch_size=2).sort_values("player_id").reset_index(drop=True)
+    large = pbp.aggregate_pbp_file(pbp_file, batch_size=1000).sort_values("player_id").reset_index(drop=True)
+    pd.testing.assert_frame_equal(small, large)
+
+    f = small.set_index("player_id")
+    assert f.loc["R1", "rz_carries"] == 2  # POST play excluded
+    assert f.loc["R1", "gl_carries"] == 1
+    assert f.loc["R1", "targets"] == 1
+    assert f.loc["W1", "rz_touches"] == 1
+    assert f.loc["W2", "rz_targets"] == 0
+    assert f.loc["W2", "air_yards_share"] == pytest.approx(30 / 40)
+    assert f.loc["W3", "air_yards_share"] == pytest.approx(1.0)
+
+
+def test_update_writes_partition_that_loads(tmp_path, pbp_file):
+    raw_dir = tmp_path / "raw"
+    source = str(tmp_path / "pbp_{season}.parquet")
+    pbp.update_pbp(seasons=[2024], source=source, batch_size=3, raw_dir=raw_dir)
+
+    assert pbp.partition_path(raw_dir, 2024).exists()
+    assert pbp_file.exists()  # local sources are never deleted
+
+    loaded = pbp.load_pbp_features(raw_dir, [2023, 2024])
+    assert set(loaded["player_id"]) == {"R1", "W1", "W2", "W3"}
+    assert set(pbp.FEATURES) <= set(loaded.columns)
+
+
+def test_missing_columns_raise(tmp_path):
+    path = tmp_path / "bad.parquet"
+    _plays().drop(columns=["air_yards"]).to_parquet(path, index=False)
+    with pytest.raises(ValueError):
+        pbp.aggregate_pbp_file(path)
+
+
+def test_join_namespaces_overlapping_weekly_columns(pbp_file):
+    features = pbp.aggregate_pbp_file(pbp_file)
+    weekly = pd.DataFrame({
+        "player_id": ["W1", "W2", "QB1"],
+        "season": 2024,
+        "week": 1,
+        "targets": [7.0, 5.0, 0.0],          # nflverse weekly stats already have these
+        "air_yards_share": [0.4, 0.3, 0.0],
+    })
+    df = pbp.join_pbp_features(weekly, features).set_index("player_id")
+
+    assert df["targets"].tolist() == [7.0, 5.0, 0.0]
+    assert df["air_yards_share"].tolist() == [0.4, 0.3, 0.0]
+    assert set(pbp.JOINED_FEATURES) <= set(df.columns)
+    assert df.loc["W2", "pbp_air_yards_share"] == pytest.approx(30 / 40)
+    assert df.loc["QB1", "pbp_targets"] == 0.0  # no plays -> filled, not NaN
+    assert not any(c.endswith(("_x", "_y")) for c in df.columns)
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from dave_ledger.core.scoring import apply_fantasy_scoring, compile_scoring_rules
+
+
+def _frame():
+    return pd.DataFrame(
+        {
+            "fantasy_group": ["TE", "WR", "RB", "QB", "LB", "DL"],
+            "receptions": [5, 5, 2, 0, 0, 0],
+            "receiving_yards": [40, 120, 10, 0, 0, 0],
+            "rushing_yards": [0, 0, 101, 20, 0, 0],
+            "passing_yards": [0, 0, 0, 410, 0, 0],
+            "def_tackles_solo": [0, 0, 0, 0, 6, 4],
+        }
+    )
+
+
+def test_flat_rules_unchanged():
+    df = _frame()
+    out = apply_fantasy_scoring(df, {"receptions": 1.0, "receiving_yards": 0.1, "missing_col": 9.0})
+    assert out["fantasy_points"].tolist() == pytest.approx([9.0, 17.0, 3.0, 0.0, 0.0, 0.0])
+
+
+def test_rich_rules():
+    rules = {
+        "receptions": 1.0,
+        "te_premium": {"stat": "receptions", "per_unit": 0.5, "positions": ["TE"]},
+        "rushing_100": {"stat": "rushing_yards", "threshold": 100, "bonus": 3.0},
+        "receiving_100": {"stat": "receiving_yards", "threshold": 100, "bonus": 3.0},
+        "passing_bonus": {"stat": "passing_yards", "tiers": [{"threshold": 300, "bonus": 3.0}, {"threshold": 400, "bonus": 2.0}]},
+        "def_tackles_solo": {"by_position": {"LB": 1.0, "DL": 1.5}},
+    }
+    out = apply_fantasy_scoring(_frame(), rules)
+    # TE: 5 rec + 2.5 premium | WR: 5 + 100yd | RB: 2 + 100yd | QB: both tiers | LB: 6 | DL: 6
+    assert out["fantasy_points"].tolist() == pytest.approx([7.5, 8.0, 5.0, 5.0, 6.0, 6.0])
+
+
+def test_compiled_plan_is_reusable_and_matches():
+    rules = {"receptions": 1.0, "te_premium": {"stat": "receptions", "per_unit": 0.5, "positions": "TE"}}
+    plan = compile_scoring_rules(rules)
+    assert plan.flat == {"receptions": 1.0}
+    df = _frame()
+    pd.testing.assert_frame_equal(apply_fantasy_scoring(df, plan), apply_fantasy_scoring(df, rules))
+
+
+def test_invalid_rules_raise():
+    with pytest.raises(ValueError):
+        compile_scoring_rules({"bad": {"stat": "receptions", "multiplier": 1.0}})
+    with pytest.raises(ValueError):
+        compile_scoring_rules({"bad": {"stat": "rushing_yards", "threshold": 100}})
+    with pytest.raises(ValueError):
+        compile_scoring_rules({"bad": {"stat": "rushing_yards", "tiers": [{"threshold": 100}]}})
+    with pytest.raises(ValueError):
+        compile_scoring_rules({"bad": {"stat": "rushing_yards", "tiers": [{"threshold": 100, "bonus": 3, "per": 1}]}})
@@ -0,0 +1,98 @@
+import copy
+
+import numpy as np
+import pytest
+
+from dave_ledger.analysis.valuation import AssetValuator
+
+FLOORS = {"QB": 10.0, "RB": 6.0, "WR": 6.0, "TE": 5.0}
+GROUPS = ["QB", "RB", "WR", "TE"]
+
+
+# Two players per position: one in a growth window, one decaying; some missed games
+PLAYERS = [
+    # player_id, group, birth_year, ppg, games missed in 2025
+    ("QB1", "QB", 1990, 21.0, 2),
+    ("QB2", "QB", 1999, 17.0, 0),
+    ("RB1", "RB", 1996, 14.0, 3),
+    ("RB2", "RB", 2001, 11.0, 0),
+    ("WR1", "WR", 2001, 12.0, 1),
+    ("WR2", "WR", 1994, 18.0, 4),
+    ("TE1", "TE", 1993, 10.0, 0),
+    ("TE2", "TE", 1998, 9.0, 2),
+]
+
+
+@pytest.fixture
+def history(make_history):
+    players = []
+    for pid, group, birth_year, ppg, missed in PLAYERS:
+        last = np.full(17, ppg)
+        last[17 - missed:] = 0.0
+        players.append((pid, group, birth_year, {2023: ppg, 2024: ppg, 2025: last}))
+    return make_history(players)
+
+
+def _cfg():
+    return {
+        "context": {"current_year": 2025},
+        "valuation": {
+            "sensitivities": True,
+            "epsilon_val": 0.0,
+            "discount_rate": 0.12,
+            "availability_weight": 20,
+            "availability_priors": {g: 0.9 for g in GROUPS},
+            "performance_decay": {g: {"start_age": 29, "decay_rate": 0.08} for g in GROUPS},
+            "performance_growth": {g: {"end_age": 28, "growth_rate": 0.05} for g in GROUPS},
+            "retirement_risk": {g: {"cliff_age": 33.0, "k": 0.5} for g in GROUPS},
+        },
+    }
+
+
+def _value(history, cfg):
+    return AssetValuator(history, cfg, baselines=FLOORS).run_valuation().set_index("player_id")
+
+
+PARAMS = [
+    ("discount_rate", lambda v: v, None),
+    ("availability_weight", lambda v: v, None),
+    ("growth_rate", lambda v: v["performance_growth"]["WR"], "WR"),
+    ("decay_rate", lambda v: v["performance_decay"]["QB"], "QB"),
+    ("cliff_age", lambda v: v["retirement_risk"]["RB"], "RB"),
+    ("k", lambda v: v["retirement_risk"]["TE"], "TE"),
+]
+
+
+@pytest.mark.parametrize("name,target,group", PARAMS)
+def test_sensitivities_match_finite_differences(history, name, target, group):
+    base = _value(history, _cfg())
+    h = 1e-5
+
+    def bumped(step):
+        cfg = copy.deepcopy(_cfg())
+        holder = cfg["valuation"] if group is None else target(cfg["valuation"])
+        holder[name] += step
+        return _value(history, cfg)
+
+    up, down = bumped(h), bumped(-h)
+    players = base.index if group is None else base.index[base["fantasy_group"] == group]
+    for col in ("dcf_value", "vorp"):
+        fd = (up.loc[players, col] - down.loc[players, col]) / (2 * h)
+        prefix = "dcf" if col == "dcf_value" else "vorp"
+        np.testing.assert_allclose(base.loc[players, f"{prefix}_d_{name}"], fd, rtol=1e-4, atol=1e-4)
+
+    assert base.loc[players, f"dcf_d_{name}"].abs().sum() > 0
+
+
+def test_sensitivity_signs(history):
+    board = _value(history, _cfg())
+    assert (board["dcf_d_discount_rate"] <= 0).all()
+    assert (board["dcf_d_decay_rate"] <= 0).all()
+    assert (board["dcf_d_cliff_age"] >= 0).all()
+
+
+def test_sensitivities_off_by_default(history):
+    cfg = _cfg()
+    del cfg["valuation"]["sensitivities"]
+    board = _value(history, cfg)
+    assert not [c for c in board.columns if "_d_" in c]
@@ -0,0 +1,169 @@
+import os
+
+import pandas as pd
+import pytest
+
+from dave_ledger.watch import Watcher, read_status
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _touch(path, content="x"):
+    path.write_text(content)
+    # Bump mtime explicitly so the change is visible even on coarse filesystems
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def env(tmp_path):
+    cfg_dir, raw_dir, board_dir = tmp_path / "config", tmp_path / "raw", tmp_path / "board"
+    cfg_dir.mkdir()
+    raw_dir.mkdir()
+    (cfg_dir / "default.yaml").write_text("a: 1")
+    (raw_dir / "weekly.parquet").write_text("v1")
+
+    calls = []
+    cfg = {"context": {"current_year": 2025}}
+    stages = {
+        "load_config": lambda: dict(cfg),
+        "ingest": lambda c: calls.append("ingest"),
+        "transform": lambda: calls.append("transform") or pd.DataFrame({"x": [1, 2]}),
+        "value": lambda df, c: calls.append("value") or df.assign(v=1.0),
+    }
+    clock = FakeClock()
+    watcher = Watcher(interval=1, debounce=5, poll_every=3600, config_dir=cfg_dir, raw_dir=raw_dir,
+                      board_dir=board_dir, clock=clock, sleep=lambda s: None, stages=stages)
+    watcher.run("startup", {"data"})
+    calls.clear()
+    return watcher, clock, calls, cfg_dir, raw_dir, board_dir
+
+
+def test_idle_does_nothing(env):
+    watcher, clock, calls, *_ = env
+    for _ in range(10):
+        clock.now += 1
+        assert watcher.step() is None
+    assert calls == []
+
+
+def test_config_change_is_debounced_and_skips_transform(env):
+    watcher, clock, calls, cfg_dir, _, board_dir = env
+    _touch(cfg_dir / "local.yaml", "b: 1")
+    clock.now += 1
+    assert watcher.step() is None  # change seen, still inside the debounce window
+
+    clock.now += 3
+    _touch(cfg_dir / "local.yaml", "b: 2")  # burst continues -> window restarts
+    assert watcher.step() is None
+    clock.now += 4
+    assert watcher.step() is None
+
+    clock.now += 2
+    assert watcher.step() == "config"
+    assert calls == ["value"]
+    assert pd.read_parquet(board_dir / "board.parquet")["v"].tolist() == [1.0, 1.0]
+
+
+def test_raw_data_change_reruns_transform(env):
+    watcher, clock, calls, _, raw_dir, _ = env
+    _touch(raw_dir / "weekly.parquet", "v2")
+    (raw_dir / "snaps.parquet.tmp").write_text("in-flight")  # ignored
+    clock.now += 1
+    watcher.step()
+    clock.now += 6
+    assert watcher.step() == "data"
+    assert calls == ["transform", "value"]
+
+
+def test_scheduled_poll_ingests_and_reports_status(env):
+    watcher, clock, calls, _, _, board_dir = env
+    clock.now += 3600
+    assert watcher.step() == "poll"
+    assert calls == ["ingest", "transform", "value"]
+
+    status = read_status(board_dir)
+    assert status["last_run"]["ok"] is True
+    assert status["last_run"]["stages"] == ["ingest", "transform", "value"]
+    assert status["last_run"]["duration_s"] >= 0
+    assert status["next_poll"] is not None
+
+
+def test_failed_run_keeps_previous_board(env):
+    watcher, clock, calls, cfg_dir, _, board_dir = env
+    before = (board_dir / "board.parquet").read_bytes()
+    watcher.stages["value"] = lambda df, c: (_ for _ in ()).throw(ValueError("bad yaml"))
+
+    _touch(cfg_dir / "default.yaml", "a: [")
+    clock.now += 1
+    watcher.step()
+    clock.now += 6
+    watcher.step()
+
+    assert (board_dir / "board.parquet").read_bytes() == before
+    assert read_status(board_dir)["last_run"]["ok"] is False
+
+
+def test_edit_during_run_is_requeued(env):
+    watcher, clock, calls, cfg_dir, raw_dir, _ = env
+
+    edited = []
+
+    def value(df, c):
+        calls.append("value")
+        if not edited:
+            edited.append(True)
+            _touch(cfg_dir / "local.yaml", "b: 3")  # someone saves config mid-run
+        return df.assign(v=1.0)
+
+    watcher.stages["value"] = value
+    _touch(raw_dir / "weekly.parquet", "v2")
+    clock.now += 1
+    watcher.step()
+    clock.now += 6
+    assert watcher.step() == "data"
+
+    assert read_status(watcher.board_dir)["pending"] == ["config"]
+    clock.now += 6
+    assert watcher.step() == "config"
+    assert calls == ["transform", "value", "value"]
+
+
+def test_own_ingest_writes_are_absorbed(env):
+    watcher, clock, calls, _, raw_dir, _ = env
+    watcher.stages["ingest"] = lambda c: calls.append("ingest") or _touch(raw_dir / "weekly.parquet", "v3")
+    clock.now += 3600
+    assert watcher.step() == "poll"
+    calls.clear()
+    for _ in range(10):
+        clock.now += 1
+        assert watcher.step() is None
+    assert calls == []
+
+
+def test_failed_data_run_retransforms_on_next_config_run(env):
+    watcher, clock, calls, cfg_dir, raw_dir, _ = env
+    good_transform = watcher.stages["transform"]
+    watcher.stages["transform"] = lambda: (_ for _ in ()).throw(OSError("truncated parquet"))
+
+    _touch(raw_dir / "weekly.parquet", "half")
+    clock.now += 1
+    watcher.step()
+    clock.now += 6
+    assert watcher.step() == "data"
+    assert read_status(watcher.board_dir)["last_run"]["ok"] is False
+
+    watcher.stages["transform"] = good_transform
+    calls.clear()
+    _touch(cfg_dir / "local.yaml", "b: 1")
+    clock.now += 1
+    watcher.step()
+    clock.now += 6
+    assert watcher.step() == "config"
+    assert calls == ["transform", "value"]